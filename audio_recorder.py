@@ -39,6 +39,9 @@ class AudioRecorder:
         self.segment_counter = 0
         self.recording_timestamp = None
         self.all_frames = []  # Keep all frames for complete recording
+        self.segments_dir = None  # segments/ folder of the current recording
+        self.segment_writers = []  # Background segment WAV writes of the current recording
+        self.record_thread = None  # Capture thread of the current recording
 
         # Audio input device selection
         self.input_device_index = None  # None = default device
@@ -82,6 +85,10 @@ class AudioRecorder:
         self.recording_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.input_level = 0.0
 
+        # Create the segments directory once instead of on every segment
+        self.segments_dir = self.base_recordings_dir / f"recording_{self.recording_timestamp}" / "segments"
+        self.segments_dir.mkdir(parents=True, exist_ok=True)
+
         # Open stream with selected input device
         stream_params = {
             'format': self.FORMAT,
@@ -137,39 +144,53 @@ class AudioRecorder:
         self.record_thread.start()
 
     def save_segment(self, frames, segment_num):
-        """Save a 30-second segment to file"""
+        """Hand a segment to the callback in memory and save it to file in the background"""
         try:
-            # Create segments directory inside recording folder
-            rec_dir = self.base_recordings_dir / f"recording_{self.recording_timestamp}"
-            segments_dir = rec_dir / "segments"
-            segments_dir.mkdir(parents=True, exist_ok=True)
-
-            # Save segment file
-            segment_filename = segments_dir / f"segment_{segment_num:03d}.wav"
-            wf = wave.open(str(segment_filename), 'wb')
-            wf.setnchannels(self.CHANNELS)
-            wf.setsampwidth(self.audio.get_sample_size(self.FORMAT))
-            wf.setframerate(self.RATE)
-            wf.writeframes(b''.join(frames))
-            wf.close()
-
-            logger.debug(f"Saved segment {segment_num} to {segment_filename}")
-
-            # Call callback if provided
+            segment_filename = self.segments_dir / f"segment_{segment_num:03d}.wav"
+            pcm = b''.join(frames)
+
+            # The WAV is only needed for retranscription and speaker hints; write it off
+            # the recording thread (non-daemon, so a pending write completes on exit)
+            writer = threading.Thread(
+                target=self._write_segment_file,
+                args=(segment_filename, pcm, segment_num),
+                name=f"segment-writer-{segment_num}",
+            )
+            writer.start()
+            self.segment_writers = [w for w in self.segment_writers if w.is_alive()] + [writer]
+
+            # Call callback if provided (transcription uses the in-memory audio)
             if self.segment_callback:
-                self.segment_callback(str(segment_filename), segment_num)
+                self.segment_callback(str(segment_filename), segment_num, pcm)
 
         except Exception as e:
             logger.error(f"Error saving segment: {e}", exc_info=True)
 
+    def _write_segment_file(self, segment_filename, pcm, segment_num):
+        """Write segment audio to a WAV file"""
+        try:
+            with wave.open(str(segment_filename), 'wb') as wf:
+                wf.setnchannels(self.CHANNELS)
+                wf.setsampwidth(self.audio.get_sample_size(self.FORMAT))
+                wf.setframerate(self.RATE)
+                wf.writeframes(pcm)
+            logger.debug(f"Saved segment {segment_num} to {segment_filename}")
+        except Exception as e:
+            logger.error(f"Error saving segment {segment_num}: {e}", exc_info=True)
+
     def stop_recording(self):
         """Stop recording and return the audio file path"""
         self.is_recording = False
 
         # Wait for recording thread to finish
-        if hasattr(self, 'record_thread') and self.record_thread.is_alive():
+        if self.record_thread is not None and self.record_thread.is_alive():
             self.record_thread.join(timeout=1.0)
 
+        # Segment files must be on disk before the recording is finalized
+        for writer in self.segment_writers:
+            writer.join()
+        self.segment_writers = []
+
         # Safely close stream
         try:
             if self.stream:
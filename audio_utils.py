@@ -0,0 +1,263 @@
+"""
+Audio Utilities
+Shared helpers for inspecting recorded WAV audio before transcription
+"""
+
+import math
+import mmap
+import os
+import struct
+import wave
+from functools import lru_cache
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import webrtcvad
+except ImportError:
+    webrtcvad = None
+
+
+# Fraction of voiced 30 ms frames below which a segment is treated as silence
+MIN_VOICED_FRACTION = 0.05
+
+# RMS threshold (int16 scale, about -60 dBFS) for the energy-based fallback when
+# webrtcvad is missing: only near digital silence (muted or disconnected input)
+# counts as unvoiced, so quiet speech is never dropped without Whisper seeing it
+ENERGY_VAD_THRESHOLD = 30.0
+
+VAD_FRAME_MS = 30
+VAD_SAMPLE_RATES = (8000, 16000, 32000, 48000)
+
+# Whisper expects mono float32 audio at 16 kHz
+WHISPER_SAMPLE_RATE = 16000
+
+
+WAVE_FORMAT_PCM = 1
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+# Bytes read to find the data chunk when only the header is needed
+WAV_HEADER_PROBE_BYTES = 4096
+
+
+def parse_wav_header(buf, file_size=None):
+    """Parse the RIFF chunks of a 16-bit PCM WAV buffer.
+
+    buf may be just the start of the file, in which case file_size is used to
+    bound the data chunk. Returns (data_offset, data_size, sample_rate, channels);
+    raises ValueError for anything that is not 16-bit PCM.
+    """
+    if len(buf) < 12 or buf[0:4] != b'RIFF' or buf[8:12] != b'WAVE':
+        raise ValueError("Not a RIFF/WAVE file")
+
+    fmt = None
+    pos = 12
+    while pos + 8 <= len(buf):
+        chunk_id = bytes(buf[pos:pos + 4])
+        chunk_size, = struct.unpack_from('<I', buf, pos + 4)
+        body = pos + 8
+        if chunk_id == b'fmt ':
+            format_tag, channels, sample_rate, _, _, bits = struct.unpack_from('<HHIIHH', buf, body)
+            if format_tag not in (WAVE_FORMAT_PCM, WAVE_FORMAT_EXTENSIBLE) or bits != 16:
+                raise ValueError(f"Unsupported WAV format (tag {format_tag}, {bits} bits)")
+            fmt = (sample_rate, channels)
+        elif chunk_id == b'data':
+            if fmt is None:
+                raise ValueError("WAV data chunk before fmt chunk")
+            # Clamp to the file size (header sizes are wrong for files that were not closed cleanly)
+            data_size = min(chunk_size, (file_size or len(buf)) - body)
+            data_size -= data_size % (2 * fmt[1])
+            return body, data_size, fmt[0], fmt[1]
+        pos = body + chunk_size + (chunk_size & 1)
+    raise ValueError("WAV file has no data chunk")
+
+
+def wav_duration(audio_file):
+    """Duration in seconds of a WAV file, computed from its header and size only.
+
+    Falls back to the wave module for files that are not 16-bit PCM.
+    """
+    with open(audio_file, 'rb') as f:
+        header = f.read(WAV_HEADER_PROBE_BYTES)
+        file_size = os.fstat(f.fileno()).st_size
+    try:
+        _, data_size, sample_rate, channels = parse_wav_header(header, file_size)
+        return data_size / float(2 * channels * sample_rate)
+    except ValueError:
+        with wave.open(str(audio_file), 'rb') as wf:
+            return wf.getnframes() / float(wf.getframerate())
+
+
+class MappedWav:
+    """Memory-mapped 16-bit PCM WAV file.
+
+    `pcm` is a read-only memoryview of the sample data served straight from the
+    page cache (no read into a heap buffer). Close it once decoding is done.
+    """
+
+    def __init__(self, audio_file):
+        with open(audio_file, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            offset, size, self.sample_rate, self.channels = parse_wav_header(self._mm)
+        except Exception:
+            self._mm.close()
+            raise
+        self.pcm = memoryview(self._mm)[offset:offset + size]
+
+    @property
+    def duration(self):
+        return len(self.pcm) / float(2 * self.channels * self.sample_rate)
+
+    def close(self):
+        try:
+            self.pcm.release()
+            self._mm.close()
+        except BufferError:
+            # A numpy view still references the map; it is released when collected
+            logger.debug("Mapped WAV still in use, leaving it to the garbage collector")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load_vad(aggressiveness=2):
+    """Create a webrtcvad detector, or return None to use the energy fallback."""
+    if webrtcvad is None:
+        logger.info("webrtcvad not installed, using energy-based silence detection")
+        return None
+    return webrtcvad.Vad(aggressiveness)
+
+
+def voiced_fraction(pcm, sample_rate, vad=None):
+    """Return the fraction of 30 ms frames in mono int16 PCM that contain speech."""
+    frame_bytes = int(sample_rate * VAD_FRAME_MS / 1000) * 2
+    n_frames = len(pcm) // frame_bytes
+    if n_frames == 0:
+        return 0.0
+
+    if vad is not None and sample_rate in VAD_SAMPLE_RATES:
+        voiced = sum(
+            1 for i in range(n_frames)
+            if vad.is_speech(bytes(pcm[i * frame_bytes:(i + 1) * frame_bytes]), sample_rate)
+        )
+        return voiced / n_frames
+
+    import numpy as np
+    samples = np.frombuffer(pcm, dtype=np.int16, count=n_frames * frame_bytes // 2)
+    frames = samples.reshape(n_frames, -1).astype(np.float32)
+    rms = np.sqrt(np.mean(frames ** 2, axis=1))
+    return float(np.count_nonzero(rms > ENERGY_VAD_THRESHOLD)) / n_frames
+
+
+def pcm_rms(pcm):
+    """Return the RMS level (int16 scale) of 16-bit PCM audio."""
+    import numpy as np
+    samples = np.frombuffer(pcm, dtype=np.int16, count=len(pcm) // 2)
+    if samples.size == 0:
+        return 0.0
+    return float(np.sqrt(np.mean(np.square(samples, dtype=np.float64))))
+
+
+def is_silent_pcm(pcm, sample_rate, channels, vad=None):
+    """Return True if 16-bit PCM audio contains (almost) no speech."""
+    if channels != 1:
+        return False
+    fraction = voiced_fraction(pcm, sample_rate, vad)
+    logger.debug(f"Voiced fraction: {fraction:.1%}")
+    return fraction < MIN_VOICED_FRACTION
+
+
+def is_silent_wav(audio_file, vad=None):
+    """Return True if a mono 16-bit WAV segment contains (almost) no speech."""
+    with MappedWav(audio_file) as wav:
+        return is_silent_pcm(wav.pcm, wav.sample_rate, wav.channels, vad)
+
+
+@lru_cache(maxsize=8)
+def _polyphase_filter(up, down):
+    """Anti-aliasing FIR filter for resample_poly, designed once per rate pair."""
+    from scipy.signal import firwin
+    max_rate = max(up, down)
+    half_len = 10 * max_rate
+    return firwin(2 * half_len + 1, 1.0 / max_rate, window=('kaiser', 5.0))
+
+
+def resample_to_16k(samples, sample_rate):
+    """Resample a float32 mono array to 16 kHz (no-op when already at 16 kHz).
+
+    Raises ValueError when scipy is not installed, so callers fall back to
+    Whisper's ffmpeg decode instead of resampling without an anti-aliasing filter.
+    """
+    import numpy as np
+    if sample_rate == WHISPER_SAMPLE_RATE:
+        return samples
+
+    g = math.gcd(sample_rate, WHISPER_SAMPLE_RATE)
+    up, down = WHISPER_SAMPLE_RATE // g, sample_rate // g
+    try:
+        from scipy.signal import resample_poly
+    except ImportError:
+        raise ValueError(f"Resampling {sample_rate} Hz audio requires scipy") from None
+    return resample_poly(samples, up, down, window=_polyphase_filter(up, down)).astype(np.float32, copy=False)
+
+
+def pcm16_to_float32(pcm, sample_rate, channels):
+    """Convert 16-bit PCM bytes to the mono 16 kHz float32 array Whisper expects.
+
+    Raises ValueError for non-16 kHz audio when scipy is missing (see resample_to_16k).
+    """
+    import numpy as np
+    # Single allocation: scale the int16 view straight into a new float32 array
+    samples = np.multiply(np.frombuffer(pcm, dtype=np.int16), 1.0 / 32768.0, dtype=np.float32)
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1, dtype=np.float32)
+    return resample_to_16k(samples, sample_rate)
+
+
+def load_wav_float32(audio_file):
+    """Decode a 16-bit PCM WAV file into a mono 16 kHz float32 array (no ffmpeg)."""
+    with MappedWav(audio_file) as wav:
+        return pcm16_to_float32(wav.pcm, wav.sample_rate, wav.channels)
+
+
+def load_audio_float32(audio_file):
+    """Decode any audio file into a mono 16 kHz float32 array.
+
+    16-bit PCM WAV is decoded in-process; other formats (and WAVs that cannot
+    be resampled without scipy) go through Whisper's ffmpeg loader once, so
+    callers can reuse the array.
+    """
+    try:
+        return load_wav_float32(audio_file)
+    except ValueError:
+        from whisper.audio import load_audio
+        return load_audio(str(audio_file))
+
+
+def chunk_aligned_samples(seconds, rate, chunk):
+    """Length at 16 kHz of `seconds` of audio as the recorder cuts it: whole chunks of `chunk` frames at `rate`.
+
+    Segment lengths and overlaps are rounded down to whole recorder chunks
+    (see AudioRecorder.start_recording), so e.g. 5 s at 16 kHz in 4096-frame
+    chunks is 19 chunks = 77824 samples, not 80000.
+    """
+    frames = int(rate * seconds / chunk) * chunk
+    return frames * WHISPER_SAMPLE_RATE // rate
+
+
+def stitch_segments(segments, overlap_samples):
+    """Join overlapping float32 segments into one continuous array.
+
+    Each segment after the first starts with overlap_samples already contained
+    in its predecessor; those samples are dropped.
+    """
+    import numpy as np
+    parts = [seg if i == 0 else seg[overlap_samples:] for i, seg in enumerate(segments)]
+    if not parts:
+        return np.zeros(0, dtype=np.float32)
+    return np.concatenate(parts)
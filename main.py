@@ -4,10 +4,12 @@ Voice Capture - Tray-Only Application
 Clean implementation using composition pattern with tray_actions
 """
 
+import os
 import sys
 import json
 import queue
 import signal
+import socket
 import threading
 import shutil
 import platform
@@ -20,8 +22,12 @@ from http.server import HTTPServer, BaseHTTPRequestHandler
 
 INTERNAL_API_PORT = 5151
 
-import whisper
-import torch
+# Leave cores free for Qt and the audio callback thread: cap the OpenMP/BLAS
+# thread pools before numpy and torch are imported (so this must stay above the imports)
+DEFAULT_CPU_THREADS = max(1, (os.cpu_count() or 2) // 2)
+for _var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "VECLIB_MAXIMUM_THREADS", "NUMEXPR_NUM_THREADS"):
+    os.environ.setdefault(_var, str(DEFAULT_CPU_THREADS))
+
 from PyQt6.QtWidgets import (
     QApplication, QSystemTrayIcon, QMenu, QMessageBox,
     QDialog, QVBoxLayout, QListWidget, QPushButton, QLabel, QHBoxLayout, QListWidgetItem,
@@ -39,9 +45,14 @@ try:
 except ImportError:
     def get_version_string():
         return "unknown"
-from transcription_utils import remove_overlap, is_empty_segment
+from transcription_utils import combine_segment_texts, is_empty_segment, overlap_free_marker
+from audio_utils import (
+    load_vad, MappedWav, is_silent_pcm, pcm_rms, pcm16_to_float32, load_wav_float32,
+    stitch_segments, chunk_aligned_samples, WHISPER_SAMPLE_RATE,
+)
 from tray_actions import TrayActions
 import ollama_utils
+import whisper_backend
 from transcribe_server import start_transcribe_server_in_background
 from qdrant import QdrantIndexer, QdrantUnavailableError
 
@@ -53,6 +64,28 @@ except ImportError:
 # Setup logging
 logger = get_logger(__name__)
 
+# CPU thread counts offered in the Performance menu
+CPU_THREAD_CHOICES = sorted({n for n in (1, 2, 4, 8, DEFAULT_CPU_THREADS, os.cpu_count() or 1)
+                             if n <= (os.cpu_count() or 1)})
+
+# Whisper models offered in the tray menu: (model name, menu label)
+WHISPER_MODELS = [
+    ("tiny", "Tiny (Snel, ~1GB)"),
+    ("small", "Small (Goed, ~2GB)"),
+    ("medium", "Medium (Beter, ~5GB)"),
+    ("large", "Large (Best, ~10GB)"),
+    ("distil-large-v3", "Distil Large v3 (Snel + goed, ~2GB)"),
+    ("large-v3-turbo", "Large v3 Turbo (Snel + best, ~6GB)"),
+]
+
+# Queued segments transcribed together when the worker falls behind
+# (3 x 10 s with 5 s overlap = 20 s, within one 30 s Whisper window)
+SEGMENT_BATCH_SIZE = 3
+
+# Tray notification icons (resolved once instead of on every showMessage call)
+_TRAY_INFO = QSystemTrayIcon.MessageIcon.Information
+_TRAY_WARNING = QSystemTrayIcon.MessageIcon.Warning
+
 
 def check_ffmpeg():
     """Check if ffmpeg is installed and accessible."""
@@ -113,12 +146,57 @@ Na installatie: herstart deze applicatie."""
     return False
 
 
+def _fast_rmtree(path):
+    """Delete a directory tree with the platform's native rm/rd, falling back to shutil.rmtree."""
+    path = Path(path)
+    if platform.system() == "Windows":
+        cmd = ["cmd", "/c", "rd", "/s", "/q", str(path)]
+    else:
+        cmd = ["rm", "-rf", "--", str(path)]
+    try:
+        subprocess.run(cmd, check=False, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except OSError as e:
+        logger.debug(f"Native delete of {path} failed: {e}")
+    if path.exists():
+        shutil.rmtree(path)
+
+
+def _recording_name(moment):
+    """Default recording name, e.g. 'Opname 2024-05-01 14:30'."""
+    # isoformat yields the same text as strftime('%Y-%m-%d %H:%M') without parsing a format
+    return f"Opname {moment.isoformat(' ', 'minutes')}"
+
+
+# Painted tray icons by look: None (idle) or (radius, alpha) of the red recording dot
+_tray_icon_cache = {}
+
+
 def create_tray_icon(recording=False, level=0.0, pulse_phase=0):
     """Create a tray icon.
 
     Idle: white open circle.
     Recording: white ring + animated red center based on input level.
+    Each distinct look is painted once and cached.
     """
+    key = None
+    if recording:
+        # Animated red center reacting to live input level
+        clamped = max(0.0, min(1.0, float(level)))
+        pulse = 0.6 if (pulse_phase % 2 == 0) else 1.0
+
+        # Radius between 4 and 7 px depending on level + subtle pulse
+        radius = 4 + int(round(3 * clamped * pulse))
+        alpha = 180 + int(75 * clamped)
+        key = (radius, alpha)
+
+    icon = _tray_icon_cache.get(key)
+    if icon is None:
+        icon = _tray_icon_cache[key] = _paint_tray_icon(key)
+    return icon
+
+
+def _paint_tray_icon(dot):
+    """Paint a tray icon; dot is None (idle) or the (radius, alpha) of the red center."""
     # Create a 22x22 pixmap (standard size for macOS menu bar icons)
     pixmap = QPixmap(22, 22)
     pixmap.fill(Qt.GlobalColor.transparent)
@@ -126,7 +204,7 @@ def create_tray_icon(recording=False, level=0.0, pulse_phase=0):
     painter = QPainter(pixmap)
     painter.setRenderHint(QPainter.RenderHint.Antialiasing)
 
-    if recording:
+    if dot is not None:
         # Outer white ring
         pen = QPen(QColor(255, 255, 255))
         pen.setWidth(2)
@@ -134,14 +212,7 @@ def create_tray_icon(recording=False, level=0.0, pulse_phase=0):
         painter.setBrush(Qt.BrushStyle.NoBrush)
         painter.drawEllipse(2, 2, 18, 18)
 
-        # Animated red center reacting to live input level
-        clamped = max(0.0, min(1.0, float(level)))
-        pulse = 0.6 if (pulse_phase % 2 == 0) else 1.0
-
-        # Radius between 4 and 7 px depending on level + subtle pulse
-        radius = 4 + int(round(3 * clamped * pulse))
-        alpha = 180 + int(75 * clamped)
-
+        radius, alpha = dot
         painter.setBrush(QColor(244, 67, 54, alpha))
         painter.setPen(Qt.PenStyle.NoPen)
         diameter = radius * 2
@@ -313,15 +384,21 @@ class VoiceCapture(QObject):
     transcription_complete = pyqtSignal(dict)
     model_loaded = pyqtSignal(str, object)  # (model_name, model_object)
     segment_transcribed = pyqtSignal(str, int)  # Signal for incremental transcription updates (text, segment_num)
+    segments_drained = pyqtSignal()  # Transcription worker finished every queued segment
+    recording_saved = pyqtSignal(str, str)  # (audio_file, recording_id) once the recorder has stopped and saved
     ollama_status_checked = pyqtSignal(bool, object)  # (available, models_list)
     ollama_title_generated = pyqtSignal(str, str)      # (recording_id, title)
     hotkey_toggle_requested = pyqtSignal()             # Global hotkey -> toggle recording
     speaker_id_result = pyqtSignal(str, object, object, object, object, int)  # (rec_id, results, store, error, queue, index)
     speaker_id_silent_done = pyqtSignal(str, object, object)                  # (rec_id, results, error) for Entry Point B
+    retranscription_done = pyqtSignal(str, int)        # (model_name, transcription length) from the retranscription worker
+    retranscription_failed = pyqtSignal(str, bool)     # (message, critical) from the retranscription worker
 
     def __init__(self):
         super().__init__()
 
+        self.tray_icon = None  # Created by init_tray_icon at the end of __init__
+
         # Core components
         self.recorder = AudioRecorder()
         self.recording_manager = RecordingManager()
@@ -331,8 +408,15 @@ class VoiceCapture(QObject):
 
         # Model caching: store loaded models
         self.loaded_models = {}  # {model_name: model_object}
-        self.selected_model_name = "medium"  # Default selected model
+        self.loading_models = set()  # Model names with a load in progress
+        self.pending_reloads = set()  # Model names to load again once their current load finishes
+        self.selected_model_name = "large-v3-turbo"  # Default selected model
         self.use_mlx = False  # Use MLX Whisper (Apple Silicon only), default off
+        self.vad_model = None  # webrtcvad detector (None = energy-based fallback)
+        self.torch_compile = False  # torch.compile the Whisper encoder and decoder (dynamic shapes); off by default, settings.json only
+        self.inference_process = False  # Run Whisper in a separate worker process (settings.json only)
+        self.int8_quantization = True  # int8 weights for CPU inference (settings.json only)
+        self.cpu_threads = DEFAULT_CPU_THREADS  # torch intra-op threads for CPU inference
 
         # Ollama title generation
         self.ollama_available = False
@@ -346,30 +430,49 @@ class VoiceCapture(QObject):
 
         # Load persisted settings (may override defaults above)
         self._load_settings()
+        # Settings changes are written once things settle (menu toggles often come in bursts)
+        self.settings_save_timer = QTimer(self)
+        self.settings_save_timer.setSingleShot(True)
+        self.settings_save_timer.setInterval(500)
+        self.settings_save_timer.timeout.connect(self._write_settings)
+        whisper_backend.set_cpu_threads(self.cpu_threads)
 
         # Recording state
         self.is_recording = False
+        self.is_stopping = False  # Stop requested; blocks start/stop until the recording is finalized
         self.current_audio_file = None
         self.current_recording_id = None
+        self.current_rec_dir = None  # recording_<id>/ folder of the live recording
+        self.current_segments_dir = None  # its segments/ folder
+        self.audio_devices = {}  # {device index: name} as listed in the Input Selection menu
 
         # Connect signals to slots
         self.transcription_complete.connect(self.on_transcription_complete)
         self.model_loaded.connect(self.on_model_loaded)
         self.segment_transcribed.connect(self.on_segment_transcribed)
+        self.segments_drained.connect(self.on_segments_drained)
+        self.recording_saved.connect(self.on_recording_saved)
         self.ollama_status_checked.connect(self.on_ollama_status_checked)
         self.ollama_title_generated.connect(self._apply_generated_title)
         self.hotkey_toggle_requested.connect(self._on_hotkey_toggle_requested)
         self.speaker_id_result.connect(self._handle_speaker_id_result)
         self.speaker_id_silent_done.connect(self._apply_silent_speaker_id)
-
-        # Track pending transcription
-        self.pending_transcription = False
+        self.retranscription_done.connect(self.on_retranscription_done)
+        self.retranscription_failed.connect(self.on_retranscription_failed)
 
         # Track segments for incremental transcription
-        self.segments_to_transcribe = []  # Queue of segments to transcribe
-        self.transcribed_segments = []  # List of transcribed texts
-        self.transcribed_segment_map = {}  # {segment_num: text} for live qdrant window indexing
-        self.is_transcribing_segment = False  # Flag to track if currently transcribing
+        self.segment_queue = queue.Queue()  # (segment_file, segment_num, pcm) waiting for the transcription worker
+        self.segment_texts = {}  # {segment_num: text} of the current recording, combined on finalize
+        self.overlap_free_segments = set()  # segment_nums whose text already excludes the overlap
+        self.awaiting_finalize = False  # Recording stopped; finalize once the segment queue is empty
+        self.model_loaded_event = threading.Event()  # Wakes the transcription worker when a model is loaded
+
+        # Single long-lived worker keeps the model hot and transcribes segments in order
+        threading.Thread(target=self._transcription_loop, daemon=True, name="segment-transcriber").start()
+
+        # Retranscriptions run one at a time on their own long-lived worker
+        self.retranscribe_queue = queue.Queue()  # retranscription jobs (callables)
+        threading.Thread(target=self._retranscription_loop, daemon=True, name="retranscriber").start()
 
         # Qdrant live index (best effort) — initialized in background to avoid blocking startup
         self.qdrant_indexer = None
@@ -381,8 +484,8 @@ class VoiceCapture(QObject):
         self.dashboard_client = None
         threading.Thread(target=self._init_dashboard_client, daemon=True, name="dashboard-init").start()
 
-        # Track pending recording name (set when recording stops)
-        self.pending_recording_name = None
+        # Moment the pending recording was stopped (name and end time are derived from it)
+        self.pending_recording_timestamp = None
 
         # Track consecutive empty segments for silence detection
         self.consecutive_empty_segments = 0
@@ -402,6 +505,7 @@ class VoiceCapture(QObject):
 
         # Tray animation state (recording input meter)
         self.icon_pulse_phase = 0
+        self.tray_icon_image = None  # Cached QIcon currently shown in the tray
         self.icon_animation_timer = QTimer(self)
         self.icon_animation_timer.setInterval(140)
         self.icon_animation_timer.timeout.connect(self.update_recording_tray_icon)
@@ -418,9 +522,10 @@ class VoiceCapture(QObject):
         # Setup global hotkey (macOS only)
         self.setup_global_hotkey()
 
-        # Load model on startup (skip when MLX is active)
+        # Load model on startup (skip when MLX is active); loading runs on a background
+        # thread, so start it right away to overlap it with the rest of startup
         if not self.use_mlx:
-            QTimer.singleShot(500, lambda: self.load_model_async(self.selected_model_name))
+            self.load_model_async(self.selected_model_name)
 
         # Check Ollama availability asynchronously
         QTimer.singleShot(300, self.check_ollama_async)
@@ -471,7 +576,7 @@ class VoiceCapture(QObject):
             if path.exists():
                 with open(path, "r", encoding="utf-8") as f:
                     data = json.load(f)
-                valid_models = {"tiny", "small", "medium", "large"}
+                valid_models = {name for name, _label in WHISPER_MODELS}
                 if data.get("model") in valid_models:
                     self.selected_model_name = data["model"]
                 if isinstance(data.get("use_mlx"), bool):
@@ -482,21 +587,40 @@ class VoiceCapture(QObject):
                     self.selected_ollama_model = data["ollama_model"]
                 if isinstance(data.get("dashboard_enabled"), bool):
                     self.dashboard_enabled = data["dashboard_enabled"]
+                if isinstance(data.get("torch_compile"), bool):
+                    self.torch_compile = data["torch_compile"]
+                if isinstance(data.get("inference_process"), bool):
+                    self.inference_process = data["inference_process"]
+                if isinstance(data.get("int8_quantization"), bool):
+                    self.int8_quantization = data["int8_quantization"]
+                if data.get("cpu_threads") in CPU_THREAD_CHOICES:
+                    self.cpu_threads = data["cpu_threads"]
                 logger.info(f"Settings loaded: model={self.selected_model_name}, use_mlx={self.use_mlx}, determine_title={self.determine_title}, dashboard_enabled={self.dashboard_enabled}")
         except Exception as e:
             logger.warning(f"Could not load settings: {e}")
 
     def _save_settings(self):
+        """Schedule a settings write; repeated changes within 500 ms are written once."""
+        self.settings_save_timer.start()
+
+    def _write_settings(self):
         try:
             path = self._settings_path()
-            with open(path, "w", encoding="utf-8") as f:
+            # Write next to the target and rename, so a crash never leaves a partial file
+            tmp_path = path.with_suffix(".json.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
                 json.dump({
                     "model": self.selected_model_name,
                     "use_mlx": self.use_mlx,
                     "determine_title": self.determine_title,
                     "ollama_model": self.selected_ollama_model,
                     "dashboard_enabled": self.dashboard_enabled,
+                    "torch_compile": self.torch_compile,
+                    "inference_process": self.inference_process,
+                    "int8_quantization": self.int8_quantization,
+                    "cpu_threads": self.cpu_threads,
                 }, f, indent=2)
+            os.replace(tmp_path, path)
             logger.debug(f"Settings saved: model={self.selected_model_name}, use_mlx={self.use_mlx}, determine_title={self.determine_title}")
         except Exception as e:
             logger.warning(f"Could not save settings: {e}")
@@ -505,7 +629,7 @@ class VoiceCapture(QObject):
         """Initialize system tray icon and menu (GUI)"""
         # Create system tray icon
         self.tray_icon = QSystemTrayIcon(self)
-        self.tray_icon.setIcon(create_tray_icon(recording=False))
+        self._set_tray_icon(create_tray_icon(recording=False))
 
         # Create context menu for tray icon
         self.tray_menu = QMenu()
@@ -527,35 +651,14 @@ class VoiceCapture(QObject):
         model_action_group.setExclusive(True)
 
         # Add model options
-        self.tray_tiny_action = model_menu.addAction("Tiny (Snel, ~1GB)")
-        self.tray_tiny_action.setCheckable(True)
-        self.tray_tiny_action.triggered.connect(lambda: self.on_tray_set_model("tiny"))
-        model_action_group.addAction(self.tray_tiny_action)
-
-        self.tray_small_action = model_menu.addAction("Small (Goed, ~2GB)")
-        self.tray_small_action.setCheckable(True)
-        self.tray_small_action.triggered.connect(lambda: self.on_tray_set_model("small"))
-        model_action_group.addAction(self.tray_small_action)
-
-        self.tray_medium_action = model_menu.addAction("Medium (Beter, ~5GB)")
-        self.tray_medium_action.setCheckable(True)
-        self.tray_medium_action.triggered.connect(lambda: self.on_tray_set_model("medium"))
-        model_action_group.addAction(self.tray_medium_action)
-
-        self.tray_large_action = model_menu.addAction("Large (Best, ~10GB)")
-        self.tray_large_action.setCheckable(True)
-        self.tray_large_action.triggered.connect(lambda: self.on_tray_set_model("large"))
-        model_action_group.addAction(self.tray_large_action)
-
-        # Set initial selection based on current model
-        if self.selected_model_name == "medium":
-            self.tray_medium_action.setChecked(True)
-        elif self.selected_model_name == "tiny":
-            self.tray_tiny_action.setChecked(True)
-        elif self.selected_model_name == "small":
-            self.tray_small_action.setChecked(True)
-        elif self.selected_model_name == "large":
-            self.tray_large_action.setChecked(True)
+        self.tray_model_actions = {}
+        for name, label in WHISPER_MODELS:
+            action = model_menu.addAction(label)
+            action.setCheckable(True)
+            action.setChecked(name == self.selected_model_name)
+            action.triggered.connect(lambda checked, m=name: self.on_tray_set_model(m))
+            model_action_group.addAction(action)
+            self.tray_model_actions[name] = action
 
         self.tray_menu.addMenu(model_menu)
 
@@ -565,6 +668,25 @@ class VoiceCapture(QObject):
         self.tray_mlx_action.setChecked(self.use_mlx)
         self.tray_mlx_action.triggered.connect(self.on_tray_toggle_mlx)
 
+        # Performance submenu: CPU threads used for Whisper inference
+        performance_menu = QMenu("Performance", self.tray_menu)
+        cpu_menu = QMenu("CPU cores", performance_menu)
+        cpu_action_group = QActionGroup(cpu_menu)
+        cpu_action_group.setExclusive(True)
+
+        self.tray_cpu_thread_actions = {}
+        for n in CPU_THREAD_CHOICES:
+            label = f"{n} (standaard)" if n == DEFAULT_CPU_THREADS else str(n)
+            action = cpu_menu.addAction(label)
+            action.setCheckable(True)
+            action.setChecked(n == self.cpu_threads)
+            action.triggered.connect(lambda checked, n=n: self.on_tray_set_cpu_threads(n))
+            cpu_action_group.addAction(action)
+            self.tray_cpu_thread_actions[n] = action
+
+        performance_menu.addMenu(cpu_menu)
+        self.tray_menu.addMenu(performance_menu)
+
         self.tray_menu.addSeparator()
 
         # Ollama title determination
@@ -710,13 +832,13 @@ class VoiceCapture(QObject):
                 self.tray_actions.stop_recording()
                 # Update UI
                 self.icon_animation_timer.stop()
-                self.tray_icon.setIcon(create_tray_icon(recording=False))
+                self._set_tray_icon(create_tray_icon(recording=False))
                 self.tray_icon.setToolTip("Voice Capture (klik om op te nemen)")
                 self.tray_toggle_action.setText("Start Opname")
             except Exception as e:
                 # Handle error in UI
                 self.icon_animation_timer.stop()
-                self.tray_icon.setIcon(create_tray_icon(recording=False))
+                self._set_tray_icon(create_tray_icon(recording=False))
                 self.tray_icon.setToolTip("Voice Capture (klik om op te nemen)")
                 self.tray_toggle_action.setText("Start Opname")
                 QMessageBox.critical(None, "Fout", f"Fout bij opslaan: {str(e)}")
@@ -726,14 +848,22 @@ class VoiceCapture(QObject):
         if not self.is_recording:
             return
         level = getattr(self.recorder, "input_level", 0.0)
-        self.tray_icon.setIcon(create_tray_icon(recording=True, level=level, pulse_phase=self.icon_pulse_phase))
+        self._set_tray_icon(create_tray_icon(recording=True, level=level, pulse_phase=self.icon_pulse_phase))
         self.icon_pulse_phase = (self.icon_pulse_phase + 1) % 1000000
 
+    def _set_tray_icon(self, icon):
+        """Show a (cached) tray icon, skipping the update when it is already shown."""
+        if icon is self.tray_icon_image:
+            return
+        self.tray_icon.setIcon(icon)
+        self.tray_icon_image = icon
+
     def refresh_tray_input_devices(self):
         """Refresh the audio input device list in tray menu - GUI handler"""
         try:
             # Get list of audio input devices
             devices = self.recorder.get_audio_devices()
+            self.audio_devices = {device['index']: device['name'] for device in devices}
 
             # Clear existing input device actions
             if self.tray_input_menu:
@@ -748,7 +878,8 @@ class VoiceCapture(QObject):
                 default_action.setCheckable(True)
                 default_action.setChecked(self.recorder.input_device_index is None)
                 input_device_group.addAction(default_action)
-                default_action.triggered.connect(lambda checked, idx=None: self.on_tray_set_input_device(idx))
+                default_action.setData(None)
+                default_action.triggered.connect(self._on_tray_input_action_triggered)
 
                 # Add separator
                 self.tray_input_menu.addSeparator()
@@ -762,22 +893,28 @@ class VoiceCapture(QObject):
                     action.setCheckable(True)
                     action.setChecked(self.recorder.input_device_index == device_index)
                     input_device_group.addAction(action)
-                    action.triggered.connect(lambda checked, idx=device_index: self.on_tray_set_input_device(idx))
+                    action.setData(device_index)
+                    action.triggered.connect(self._on_tray_input_action_triggered)
 
                 logger.debug(f"Refreshed tray input devices menu with {len(devices)} devices")
 
         except Exception as e:
             logger.error(f"Error refreshing tray input devices: {e}", exc_info=True)
 
-    def on_tray_set_input_device(self, device_index):
+    def _on_tray_input_action_triggered(self):
+        """Shared slot for the Input Selection actions; the device index is the action's data"""
+        action = self.sender()
+        self.on_tray_set_input_device(action.data(), action.text())
+
+    def on_tray_set_input_device(self, device_index, device_name=None):
         """Handle set input device from tray - GUI handler"""
         try:
-            message = self.tray_actions.set_input_device(device_index)
+            message = self.tray_actions.set_input_device(device_index, device_name)
             # Show notification
             self.tray_icon.showMessage(
                 "Invoerapparaat Gewijzigd",
                 message,
-                QSystemTrayIcon.MessageIcon.Information,
+                _TRAY_INFO,
                 2000
             )
         except Exception as e:
@@ -786,13 +923,14 @@ class VoiceCapture(QObject):
     def on_tray_set_model(self, model_name):
         """Handle set Whisper model from tray - GUI handler"""
         try:
+            previous_model = self.selected_model_name
             message = self.tray_actions.set_model(model_name)
+            # Free older models, but keep the one just deselected so switching back is instant
+            self._release_unselected_models(keep=previous_model)
 
             # Update tray menu checkmarks
-            self.tray_tiny_action.setChecked(model_name == "tiny")
-            self.tray_small_action.setChecked(model_name == "small")
-            self.tray_medium_action.setChecked(model_name == "medium")
-            self.tray_large_action.setChecked(model_name == "large")
+            for name, action in self.tray_model_actions.items():
+                action.setChecked(name == model_name)
 
             if self.use_mlx:
                 message += " (MLX)"
@@ -803,7 +941,7 @@ class VoiceCapture(QObject):
             self.tray_icon.showMessage(
                 "Model Gewijzigd",
                 message,
-                QSystemTrayIcon.MessageIcon.Information,
+                _TRAY_INFO,
                 2000
             )
         except Exception as e:
@@ -832,12 +970,29 @@ class VoiceCapture(QObject):
             self.tray_icon.showMessage(
                 "MLX Whisper",
                 f"MLX (Apple Silicon) transcriptie {status}",
-                QSystemTrayIcon.MessageIcon.Information,
+                _TRAY_INFO,
                 2000
             )
         except Exception as e:
             QMessageBox.warning(None, "Fout", f"Kon MLX niet instellen: {str(e)}")
 
+    def on_tray_set_cpu_threads(self, n_threads):
+        """Handle CPU cores selection from tray - GUI handler"""
+        self.cpu_threads = n_threads
+        whisper_backend.set_cpu_threads(n_threads)
+        self._save_settings()
+        for n, action in self.tray_cpu_thread_actions.items():
+            action.setChecked(n == n_threads)
+
+        # faster-whisper and the worker process fix their thread count when the model
+        # is loaded; reload it (the current model keeps serving until the new one is ready)
+        message = f"Transcriptie gebruikt {n_threads} CPU-kernen"
+        model = self.loaded_models.get(self.selected_model_name)
+        if isinstance(model, whisper_backend.FasterWhisperModel) or hasattr(model, "close"):
+            self.load_model_async(self.selected_model_name, reload=True)
+            message += " (model wordt opnieuw geladen)"
+        self.tray_icon.showMessage("Performance", message, _TRAY_INFO, 2000)
+
     def on_tray_toggle_determine_title(self):
         """Handle 'Bepaal titel na opname' toggle - GUI handler"""
         self.determine_title = self.tray_determine_title_action.isChecked()
@@ -846,7 +1001,7 @@ class VoiceCapture(QObject):
         self.tray_icon.showMessage(
             "Titelbepaling",
             f"Automatische titelbepaling {status}",
-            QSystemTrayIcon.MessageIcon.Information,
+            _TRAY_INFO,
             2000,
         )
 
@@ -860,7 +1015,7 @@ class VoiceCapture(QObject):
             self.tray_icon.showMessage(
                 "Dashboard",
                 "Dashboard wordt gestart...",
-                QSystemTrayIcon.MessageIcon.Information,
+                _TRAY_INFO,
                 2000,
             )
         else:
@@ -868,7 +1023,7 @@ class VoiceCapture(QObject):
             self.tray_icon.showMessage(
                 "Dashboard",
                 "Dashboard gestopt",
-                QSystemTrayIcon.MessageIcon.Information,
+                _TRAY_INFO,
                 2000,
             )
         self._update_dashboard_menu_state()
@@ -882,28 +1037,25 @@ class VoiceCapture(QObject):
         self.tray_icon.showMessage(
             "Dashboard",
             "Dashboard wordt opgestart, even wachten...",
-            QSystemTrayIcon.MessageIcon.Information,
+            _TRAY_INFO,
             3000,
         )
         def _wait_and_open():
-            import time as _time
             for _ in range(16):  # up to 8 seconds
-                _time.sleep(0.5)
+                time.sleep(0.5)
                 if self._check_dashboard_running():
                     webbrowser.open("http://localhost:8100")
                     return
             self.tray_icon.showMessage(
                 "Dashboard",
                 "Dashboard kon niet worden bereikt. Controleer de logs.",
-                QSystemTrayIcon.MessageIcon.Warning,
+                _TRAY_WARNING,
                 4000,
             )
-        import threading as _threading
-        _threading.Thread(target=_wait_and_open, daemon=True).start()
+        threading.Thread(target=_wait_and_open, daemon=True).start()
 
     def _check_dashboard_running(self) -> bool:
         """Return True if the dashboard is listening on port 8100."""
-        import socket
         try:
             with socket.create_connection(("127.0.0.1", 8100), timeout=0.5):
                 return True
@@ -1002,8 +1154,7 @@ class VoiceCapture(QObject):
         logger.info("Ollama: beschikbaarheid controleren ...")
 
         def _check():
-            available = ollama_utils.check_ollama_available()
-            models = ollama_utils.get_ollama_models() if available else []
+            available, models = ollama_utils.get_ollama_status()
             self.ollama_status_checked.emit(available, models)
 
         t = threading.Thread(target=_check, daemon=True, name="ollama-check")
@@ -1027,8 +1178,7 @@ class VoiceCapture(QObject):
 
         def _run():
             try:
-                available = ollama_utils.check_ollama_available()
-                models = ollama_utils.get_ollama_models() if available else []
+                available, models = ollama_utils.get_ollama_status()
                 self.ollama_status_checked.emit(available, models)
                 if not available:
                     logger.warning("Ollama: titelbepaling geannuleerd — Ollama niet beschikbaar")
@@ -1064,13 +1214,12 @@ class VoiceCapture(QObject):
                     logger.info(f"Qdrant: recording_name bijgewerkt voor {recording_id}")
             except Exception as e:
                 logger.warning(f"Qdrant: titel update mislukt voor {recording_id}: {e}")
-        import threading as _threading
-        _threading.Thread(target=_update_qdrant, daemon=True, name="qdrant-title").start()
-        if hasattr(self, 'tray_icon'):
+        threading.Thread(target=_update_qdrant, daemon=True, name="qdrant-title").start()
+        if self.tray_icon is not None:
             self.tray_icon.showMessage(
                 "Titel Bepaald",
                 title,
-                QSystemTrayIcon.MessageIcon.Information,
+                _TRAY_INFO,
                 4000,
             )
 
@@ -1117,6 +1266,7 @@ class VoiceCapture(QObject):
 
         # Create list widget
         list_widget = QListWidget()
+        items_by_id = {}  # {recording_id: QListWidgetItem}
 
         # Populate with recordings that have WAV files
         for recording in recordings:
@@ -1136,6 +1286,7 @@ class VoiceCapture(QObject):
             item = QListWidgetItem(display_text)
             item.setData(Qt.ItemDataRole.UserRole, recording_id)
             list_widget.addItem(item)
+            items_by_id[recording_id] = item
 
         layout.addWidget(list_widget)
 
@@ -1159,7 +1310,7 @@ class VoiceCapture(QObject):
                 self.tray_icon.showMessage(
                     "Opname id gekopieerd",
                     str(recording_id),
-                    QSystemTrayIcon.MessageIcon.Information,
+                    _TRAY_INFO,
                     2000,
                 )
             elif action == bepaal_titel_action:
@@ -1175,7 +1326,7 @@ class VoiceCapture(QObject):
                 self.tray_icon.showMessage(
                     "Titel Bepalen",
                     "Bezig met bepalen van de titel...",
-                    QSystemTrayIcon.MessageIcon.Information,
+                    _TRAY_INFO,
                     2000,
                 )
 
@@ -1183,21 +1334,18 @@ class VoiceCapture(QObject):
 
         # Update list item text when a title is generated while dialog is open
         def update_list_item_title(gen_recording_id, title):
-            for i in range(list_widget.count()):
-                it = list_widget.item(i)
-                if it.data(Qt.ItemDataRole.UserRole) == gen_recording_id:
-                    rec = self.recording_manager.get_recording(gen_recording_id)
-                    if rec:
-                        recording_date = rec.get('date', '')
-                        duration = rec.get('duration', '')
-                        current_model = rec.get('model', '')
-                        new_text = f"{title} - {recording_date}"
-                        if duration:
-                            new_text += f" ({duration})"
-                        if current_model:
-                            new_text += f" [model: {current_model}]"
-                        it.setText(new_text)
-                    break
+            it = items_by_id.get(gen_recording_id)
+            rec = self.recording_manager.get_recording(gen_recording_id)
+            if it is not None and rec:
+                recording_date = rec.get('date', '')
+                duration = rec.get('duration', '')
+                current_model = rec.get('model', '')
+                new_text = f"{title} - {recording_date}"
+                if duration:
+                    new_text += f" ({duration})"
+                if current_model:
+                    new_text += f" [model: {current_model}]"
+                it.setText(new_text)
 
         self.ollama_title_generated.connect(update_list_item_title)
         dialog.finished.connect(lambda: self.ollama_title_generated.disconnect(update_list_item_title))
@@ -1233,7 +1381,7 @@ class VoiceCapture(QObject):
             self.tray_icon.showMessage(
                 "Hertranscriptie Gestart",
                 f"Hertranscriberen met {effective_model_notif} model...",
-                QSystemTrayIcon.MessageIcon.Information,
+                _TRAY_INFO,
                 2000
             )
 
@@ -1264,6 +1412,11 @@ class VoiceCapture(QObject):
             except Exception as e:
                 logger.debug(f"Dashboard process stop bij afsluiten mislukt: {e}")
 
+        # Write settings changed just before quitting
+        if self.settings_save_timer.isActive():
+            self.settings_save_timer.stop()
+            self._write_settings()
+
         # Call business logic
         self.tray_actions.quit_application()
 
@@ -1282,9 +1435,8 @@ class VoiceCapture(QObject):
         self.is_recording = True
 
         # Clear previous segments
-        self.segments_to_transcribe = []
-        self.transcribed_segments = []
-        self.transcribed_segment_map = {}
+        self.segment_texts = {}
+        self.overlap_free_segments = set()
         self.consecutive_empty_segments = 0
         self.empty_segment_warning_shown = False
 
@@ -1295,10 +1447,13 @@ class VoiceCapture(QObject):
         # Start recording with segment callback
         self.recorder.start_recording(segment_callback=self.on_segment_ready)
         self.current_recording_id = self.recorder.recording_timestamp
+        self.current_rec_dir = self.base_recordings_dir / f"recording_{self.current_recording_id}"
+        self.current_segments_dir = self.recorder.segments_dir
 
-        # Add recording to manager (without duration initially)
-        recording_name = f"Opname {datetime.now().strftime('%Y-%m-%d %H:%M')}"
-        self.current_audio_file = str(self.base_recordings_dir / f"recording_{self.current_recording_id}" / f"recording_{self.current_recording_id}.wav")
+        # Add recording to manager in memory only (without duration initially);
+        # its JSON file is written once, when the recording is finalized
+        recording_name = _recording_name(datetime.now())
+        self.current_audio_file = str(self.current_rec_dir / f"recording_{self.current_recording_id}.wav")
 
         effective_model = f"mlx-{self.selected_model_name}" if self.use_mlx else self.selected_model_name
         logger.info(f"Transcription model: {effective_model}")
@@ -1309,7 +1464,11 @@ class VoiceCapture(QObject):
             duration=None,  # Don't set duration yet
             model=effective_model,
             segment_duration=self.segment_duration,
-            overlap_duration=self.overlap_duration
+            overlap_duration=self.overlap_duration,
+            save=False,
+            sample_rate=self.recorder.RATE,
+            channels=self.recorder.CHANNELS,
+            sample_width=self.recorder.audio.get_sample_size(self.recorder.FORMAT)
         )
 
         logger.info(f"Recording started with ID: {self.current_recording_id}")
@@ -1325,121 +1484,208 @@ class VoiceCapture(QObject):
             except Exception as e:
                 logger.warning(f"Dashboard recording_started failed: {e}")
 
-    def on_segment_ready(self, segment_file, segment_num):
-        """Called when a new segment is ready"""
+    def on_segment_ready(self, segment_file, segment_num, pcm=None):
+        """Called when a new segment is ready (pcm: the segment's int16 audio, if provided in memory)"""
         logger.debug(f"Segment {segment_num} ready: {segment_file}")
-        self.segments_to_transcribe.append((segment_file, segment_num))
-
-        # Start transcribing if not already doing so
-        if not self.is_transcribing_segment:
-            self.transcribe_next_segment()
-
-    def transcribe_next_segment(self):
-        """Transcribe the next segment in queue"""
-        if not self.segments_to_transcribe:
-            self.is_transcribing_segment = False
-            return
-
-        # Get model (not needed for MLX)
-        model_name = self.selected_model_name
-        model = None
-        if not self.use_mlx:
-            if model_name not in self.loaded_models:
-                logger.warning(f"Model {model_name} not loaded yet, waiting...")
-                self.is_transcribing_segment = False
-                return
-            model = self.loaded_models[model_name]
+        self.segment_queue.put((segment_file, segment_num, pcm))
 
-        self.is_transcribing_segment = True
+    @property
+    def is_transcribing_segment(self):
+        """True while segments are queued or being transcribed."""
+        return self.segment_queue.unfinished_tasks > 0
 
-        # Get next segment
-        segment_file, segment_num = self.segments_to_transcribe.pop(0)
-
-        # Count total segments in recording directory
-        rec_dir = self.base_recordings_dir / f"recording_{self.current_recording_id}"
-        segments_dir = rec_dir / "segments"
-        total_segments = len(list(segments_dir.glob("segment_*.wav"))) if segments_dir.exists() else 0
+    def _wait_for_model(self):
+        """Block until the selected Whisper model is loaded (None when using MLX)."""
+        while True:
+            self.model_loaded_event.clear()
+            if self.use_mlx:
+                return None
+            model = self.loaded_models.get(self.selected_model_name)
+            if model is not None:
+                return model
+            logger.warning(f"Model {self.selected_model_name} not loaded yet, waiting...")
+            self.model_loaded_event.wait(timeout=5)
+
+    def _transcription_loop(self):
+        """Transcription worker: take segments from the queue and transcribe them.
+
+        When the worker has fallen behind, consecutive queued segments are
+        transcribed together in one Whisper window.
+        """
+        while True:
+            batch = [self.segment_queue.get()]
+            while len(batch) < SEGMENT_BATCH_SIZE:
+                try:
+                    batch.append(self.segment_queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                model = self._wait_for_model()
 
-        logger.info(f"Transcribing segment {segment_num}/{total_segments}...")
+                first, last = batch[0][1], batch[-1][1]
+                label = f"segment {first}" if len(batch) == 1 else f"segments {first}-{last}"
+                logger.info(f"Transcribing {label} ({self.segment_queue.qsize()} more queued)...")
+                self.transcribe_segments(batch, model, self.use_mlx)
+            except Exception as e:
+                logger.error(f"Transcription worker error for segment {batch[0][1]}: {e}", exc_info=True)
+            finally:
+                for _ in batch:
+                    self.segment_queue.task_done()
+                if self.segment_queue.unfinished_tasks == 0:
+                    self.segments_drained.emit()
+
+    def _retranscription_loop(self):
+        """Retranscription worker: run queued retranscription jobs one by one."""
+        while True:
+            job = self.retranscribe_queue.get()
+            try:
+                job()
+            except Exception as e:
+                logger.error(f"Retranscription worker error: {e}", exc_info=True)
+            finally:
+                self.retranscribe_queue.task_done()
 
-        # Start transcription in background thread
-        thread = threading.Thread(
-            target=self.transcribe_segment_thread,
-            args=(segment_file, segment_num, model, self.use_mlx)
-        )
-        thread.daemon = True
-        thread.start()
+    def transcribe_segments(self, batch, model, use_mlx=False):
+        """Transcribe queued (segment_file, segment_num, pcm) entries (transcription worker thread)
 
-    def transcribe_segment_thread(self, audio_file, segment_num, model, use_mlx=False):
-        """Transcribe a segment in a background thread"""
+        Runs of consecutive segments share one Whisper call on their stitched
+        audio (overlap dropped); the result is split back per segment by timestamp.
+        """
+        run = []
+        for audio_file, segment_num, pcm in batch:
+            audio = self._prepare_segment_audio(audio_file, segment_num, pcm)
+            if audio is None:
+                # Keep segment texts in order: finish the run before the skipped segment
+                self._transcribe_run(run, model, use_mlx)
+                run = []
+                self._skip_segment(audio_file, segment_num)
+                continue
+            if run and (run[-1][1] != segment_num - 1 or Path(run[-1][0]).parent != Path(audio_file).parent):
+                self._transcribe_run(run, model, use_mlx)
+                run = []
+            run.append((audio_file, segment_num, audio))
+        self._transcribe_run(run, model, use_mlx)
+
+    def _prepare_segment_audio(self, audio_file, segment_num, pcm=None):
+        """Decode a segment to 16 kHz float32; None when it is too short, silent or unreadable."""
+        wav = None
         try:
-            # Check if audio file has sufficient duration
             # Whisper fails with tensor errors on very short or empty audio
-            import wave
             try:
-                with wave.open(audio_file, 'rb') as wf:
-                    frames = wf.getnframes()
-                    rate = wf.getframerate()
-                    duration = frames / float(rate)
-
-                    # Minimum 0.1 seconds of audio required
-                    if duration < 0.1:
-                        logger.warning(f"Segment {segment_num} too short ({duration:.2f}s), skipping transcription")
-                        # Create empty transcription file
-                        rec_dir = self.base_recordings_dir / f"recording_{self.current_recording_id}"
-                        segments_dir = rec_dir / "segments"
-                        transcription_file = segments_dir / f"transcription_{segment_num}.txt"
-                        with open(transcription_file, 'w', encoding='utf-8') as f:
-                            f.write("")
-                        self.segment_transcribed.emit("", segment_num)
-                        return
+                if pcm is not None:
+                    rate, channels = self.recorder.RATE, self.recorder.CHANNELS
+                else:
+                    wav = MappedWav(audio_file)
+                    pcm, rate, channels = wav.pcm, wav.sample_rate, wav.channels
+                duration = len(pcm) / float(2 * channels * rate)
+
+                # Minimum 0.1 seconds of audio required
+                if duration < 0.1:
+                    logger.warning(f"Segment {segment_num} too short ({duration:.2f}s), skipping transcription")
+                    return None
             except Exception as audio_check_error:
                 logger.error(f"Error checking audio duration for segment {segment_num}: {audio_check_error}")
-                # Create empty transcription file on error
-                rec_dir = self.base_recordings_dir / f"recording_{self.current_recording_id}"
-                segments_dir = rec_dir / "segments"
-                transcription_file = segments_dir / f"transcription_{segment_num}.txt"
-                with open(transcription_file, 'w', encoding='utf-8') as f:
-                    f.write("")
-                self.segment_transcribed.emit("", segment_num)
-                return
+                return None
+
+            # Skip Whisper for silent segments (saves a full encoder/decoder pass
+            # and avoids hallucinated text on silence)
+            try:
+                if is_silent_pcm(pcm, rate, channels, self.vad_model):
+                    logger.info(f"Segment {segment_num} contains no speech (RMS {pcm_rms(pcm):.0f}), skipping transcription")
+                    return None
+            except Exception as vad_error:
+                logger.warning(f"Voice activity check failed for segment {segment_num}: {vad_error}")
+
+            # Pass decoded float32 audio (16 kHz mono) so Whisper skips its ffmpeg decode
+            return pcm16_to_float32(pcm, rate, channels)
+        except Exception as e:
+            logger.error(f"Error decoding segment {segment_num}: {e}", exc_info=True)
+            return None
+        finally:
+            del pcm
+            if wav is not None:
+                wav.close()
+
+    def _chunk_aligned_samples(self, seconds):
+        """Samples (at 16 kHz) in `seconds` of segment audio as the recorder cuts it."""
+        return chunk_aligned_samples(seconds, self.recorder.RATE, self.recorder.CHUNK)
+
+    def _transcribe_run(self, run, model, use_mlx):
+        """Transcribe consecutive decoded segments [(segment_file, segment_num, audio)] in one call."""
+        if not run:
+            return
+        first, last = run[0][1], run[-1][1]
+        try:
+            # Segment lengths and overlaps are whole recorder chunks, not whole seconds
+            segment_samples = self._chunk_aligned_samples(self.segment_duration)
+            overlap_samples = self._chunk_aligned_samples(self.overlap_duration)
+            segment_seconds = segment_samples / WHISPER_SAMPLE_RATE
+            step_seconds = (segment_samples - overlap_samples) / WHISPER_SAMPLE_RATE
+            audio = stitch_segments([entry[2] for entry in run], overlap_samples)
 
             if use_mlx:
                 import mlx_whisper
                 result = mlx_whisper.transcribe(
-                    audio_file,
-                    path_or_hf_repo=f"mlx-community/whisper-{self.selected_model_name}-mlx",
+                    audio,
+                    path_or_hf_repo=whisper_backend.mlx_repo(self.selected_model_name),
                     verbose=False
                 )
             else:
+                audio = whisper_backend.stage_audio(audio, model)
                 # Transcribe with fp16=False to avoid NaN issues on MPS
                 result = model.transcribe(
-                    audio_file,
+                    audio,
                     task="transcribe",
                     fp16=False,
                     verbose=False
                 )
-            text = result["text"].strip()
-
-            # Save transcription to file
-            rec_dir = self.base_recordings_dir / f"recording_{self.current_recording_id}"
-            segments_dir = rec_dir / "segments"
-            transcription_file = segments_dir / f"transcription_{segment_num}.txt"
 
-            with open(transcription_file, 'w', encoding='utf-8') as f:
-                f.write(text)
+            if len(run) == 1:
+                texts = [result["text"]]
+            else:
+                # Segment i contributes the stitched audio after its overlap with segment i-1
+                texts = [[] for _ in run]
+                for part in result.get("segments", []):
+                    midpoint = (part["start"] + part["end"]) / 2
+                    if midpoint < segment_seconds:
+                        i = 0
+                    else:
+                        i = min(len(run) - 1, int((midpoint - segment_seconds) // step_seconds) + 1)
+                    texts[i].append(part["text"])
+                texts = ["".join(parts) for parts in texts]
+        except Exception as e:
+            label = f"segment {first}" if first == last else f"segments {first}-{last}"
+            logger.error(f"Error transcribing {label}: {e}", exc_info=True)
+            return
 
+        for i, ((audio_file, segment_num, _), text) in enumerate(zip(run, texts)):
+            text = text.strip()
             logger.info(f"Segment {segment_num} transcribed: {len(text)} chars")
+            # Only the first segment of a run was transcribed with its overlap audio
+            self._store_segment_text(audio_file, segment_num, text, overlap_free=i > 0)
 
-            # Emit signal
-            self.segment_transcribed.emit(text, segment_num)
+    def _skip_segment(self, audio_file, segment_num):
+        """Record an empty transcription for a segment that is not sent to Whisper."""
+        self._store_segment_text(audio_file, segment_num, "")
 
-        except Exception as e:
-            logger.error(f"Error transcribing segment {segment_num}: {e}", exc_info=True)
-        finally:
-            self.is_transcribing_segment = False
-            # Continue with next segment
-            self.transcribe_next_segment()
+    def _store_segment_text(self, audio_file, segment_num, text, overlap_free=False):
+        """Publish a segment transcription, then persist it next to the segment WAV.
+
+        Runs on the transcription worker; the in-memory text is what finalize uses,
+        so the GUI is notified before the file is written. overlap_free texts are
+        flagged with a marker file so readers skip overlap removal for them too.
+        """
+        self.segment_texts[segment_num] = text
+        if overlap_free:
+            self.overlap_free_segments.add(segment_num)
+        self.segment_transcribed.emit(text, segment_num)
+        transcription_file = Path(audio_file).parent / f"transcription_{segment_num}.txt"
+        try:
+            transcription_file.write_text(text, encoding='utf-8')
+            if overlap_free:
+                Path(overlap_free_marker(transcription_file)).touch()
+        except OSError as e:
+            logger.error(f"Could not write {transcription_file}: {e}")
 
     def on_segment_transcribed(self, text, segment_num):
         """Handle segment transcription complete"""
@@ -1460,13 +1706,13 @@ class VoiceCapture(QObject):
             return
 
         self.consecutive_empty_segments = 0
-        self.transcribed_segment_map[segment_num] = text
+        # The directly preceding segment is the indexing context (None if empty or not transcribed)
+        prev_text = self.segment_texts.get(segment_num - 1) or None
 
         # Live ingest into Qdrant (best effort)
         if self.qdrant_enabled and self.qdrant_indexer and self.current_recording_id:
             try:
                 recording = self.recording_manager.get_recording(self.current_recording_id) or {}
-                prev_text = self.transcribed_segment_map.get(segment_num - 1)
                 self.qdrant_indexer.index_live_segment(
                     recording_id=self.current_recording_id,
                     segment_num=segment_num,
@@ -1480,12 +1726,7 @@ class VoiceCapture(QObject):
 
         # Log probable speaker hint for this segment (best-effort background)
         if self.current_recording_id:
-            segment_file = (
-                self.base_recordings_dir
-                / f"recording_{self.current_recording_id}"
-                / "segments"
-                / f"segment_{segment_num:03d}.wav"
-            )
+            segment_file = self.current_segments_dir / f"segment_{segment_num:03d}.wav"
             if segment_file.exists():
                 threading.Thread(
                     target=self._log_segment_speaker_hint,
@@ -1526,46 +1767,35 @@ class VoiceCapture(QObject):
         except Exception as e:
             logger.warning(f"Segment speaker hint failed for segment {segment_num}: {e}", exc_info=True)
 
+    def on_recording_saved(self, audio_file, recording_id):
+        """Recorder stopped and wrote the complete WAV: finalize once segments are done"""
+        self.current_audio_file = audio_file
+        self.current_recording_id = recording_id
+        logger.info("Recording saved, waiting for all segments to be transcribed...")
+        self.check_and_finalize_recording()
+
     def check_and_finalize_recording(self):
-        """Check if all segments are transcribed and finalize recording"""
+        """Finalize the stopped recording as soon as all its segments are transcribed"""
         if not self.current_recording_id:
             return
+        self.awaiting_finalize = True
+        self.on_segments_drained()
 
-        rec_dir = self.base_recordings_dir / f"recording_{self.current_recording_id}"
-        segments_dir = rec_dir / "segments"
-
-        if not segments_dir.exists():
-            logger.warning("Segments directory does not exist - recording was too short, finalizing with empty transcription")
-            # Recording was too short to create any segments
-            # Finalize with empty transcription
-            self.finalize_recording_no_segments()
+    def on_segments_drained(self):
+        """Finalize a stopped recording once the transcription queue is empty (no polling)"""
+        if not self.awaiting_finalize or self.is_transcribing_segment:
             return
+        self.awaiting_finalize = False
 
-        # Find all segment WAV files
-        segment_files = sorted(segments_dir.glob("segment_*.wav"))
-
-        if len(segment_files) == 0:
+        segments_dir = self.current_segments_dir
+        if not segments_dir.exists() or not any(segments_dir.glob("segment_*.wav")):
             logger.warning("No segment files found - recording was too short, finalizing with empty transcription")
             # No segments created - recording was too short
             self.finalize_recording_no_segments()
             return
 
-        # Check if all segments have transcriptions
-        all_transcribed = True
-        for segment_file in segment_files:
-            segment_num = int(segment_file.stem.split('_')[1])
-            transcription_file = segments_dir / f"transcription_{segment_num}.txt"
-            if not transcription_file.exists():
-                all_transcribed = False
-                break
-
-        if all_transcribed and not self.is_transcribing_segment:
-            # All segments transcribed - finalize
-            logger.info("All segments transcribed - finalizing recording")
-            self.finalize_recording()
-        else:
-            # Check again in 1 second
-            QTimer.singleShot(1000, self.check_and_finalize_recording)
+        logger.info("All segments transcribed - finalizing recording")
+        self.finalize_recording()
 
     def finalize_recording(self):
         """Finalize recording after all segments are transcribed"""
@@ -1574,101 +1804,77 @@ class VoiceCapture(QObject):
 
         logger.info(f"Finalizing recording {self.current_recording_id}")
 
-        rec_dir = self.base_recordings_dir / f"recording_{self.current_recording_id}"
-        segments_dir = rec_dir / "segments"
-        audio_file = rec_dir / f"recording_{self.current_recording_id}.wav"
-
-        # Get audio duration
-        duration = self.recording_manager.get_audio_duration(str(audio_file))
+        rec_dir = self.current_rec_dir
 
-        # Combine all transcriptions with overlap removal
-        transcription_files = sorted(segments_dir.glob("transcription_*.txt"))
-        combined_texts = []
-
-        for trans_file in transcription_files:
-            try:
-                with open(trans_file, 'r', encoding='utf-8') as f:
-                    text = f.read().strip()
-                    if text:
-                        if len(combined_texts) == 0:
-                            # First segment - add as-is
-                            combined_texts.append(text)
-                        else:
-                            # Remove overlap with previous segment
-                            previous_text = combined_texts[-1]
-                            deduplicated_text = remove_overlap(previous_text, text)
-                            if deduplicated_text.strip():
-                                combined_texts.append(deduplicated_text)
-            except Exception as e:
-                logger.error(f"Error reading transcription file {trans_file}: {e}")
+        # Get audio duration of the WAV the recorder just saved
+        duration = self.recording_manager.get_audio_duration(
+            self.current_audio_file, self.recording_manager.get_recording(self.current_recording_id))
 
-        final_transcription = " ".join(combined_texts)
+        # Combine all transcriptions with overlap removal, in segment order, from the
+        # texts kept in memory by the transcription worker (the files are only a record)
+        final_transcription = combine_segment_texts(
+            (self.segment_texts[segment_num], segment_num in self.overlap_free_segments)
+            for segment_num in sorted(self.segment_texts)
+        )
 
         # Check if transcription is empty - if so, delete the recording
         if not final_transcription.strip():
             logger.info(f"Recording {self.current_recording_id} has empty transcription - removing recording folder")
 
             # Delete the entire recording folder since transcription is empty
-            import shutil
-            if rec_dir.exists():
-                try:
-                    shutil.rmtree(rec_dir)
-                    logger.info(f"Removed recording folder: {rec_dir} (duration: {duration}s)")
-                except Exception as e:
-                    logger.error(f"Failed to remove recording folder {rec_dir}: {e}", exc_info=True)
+            self._discard_recording_folder(rec_dir, duration)
 
             # Show notification
-            if hasattr(self, 'tray_icon'):
+            if self.tray_icon is not None:
                 self.tray_icon.showMessage(
                     "Opname Leeg",
                     f"Opname heeft geen transcriptie en is verwijderd ({duration}s)",
-                    QSystemTrayIcon.MessageIcon.Warning,
+                    _TRAY_WARNING,
                     3000
                 )
 
             # Reset state
             self.is_recording = False
-            self.pending_recording_name = None
+            self.is_stopping = False
+            self.pending_recording_timestamp = None
             return
 
-        # Save final transcription
-        transcription_file = rec_dir / f"transcription_{self.current_recording_id}.txt"
-        with open(transcription_file, 'w', encoding='utf-8') as f:
-            f.write(final_transcription)
-
-        # Update recording metadata
-        self.recording_manager.update_recording(
-            self.current_recording_id,
+        # Update recording metadata in memory; the files are written in the background
+        recording_id = self.current_recording_id
+        stopped_at = self.pending_recording_timestamp
+        if stopped_at:
+            recording_name = _recording_name(stopped_at)
+        else:
+            recording_name = f"Opname {recording_id}"
+        recording = self.recording_manager.update_recording(
+            recording_id,
             transcription=final_transcription,
             duration=duration,
-            name=self.pending_recording_name or f"Opname {self.current_recording_id}"
+            name=recording_name,
+            save=False
         )
+        transcription_file = rec_dir / f"transcription_{recording_id}.txt"
+        threading.Thread(
+            target=self._persist_finalized_recording,
+            args=(recording, transcription_file, final_transcription),
+            name="recording-writer",
+        ).start()
 
         logger.info(f"Recording finalized: {len(final_transcription)} chars, {duration}s")
 
         # Show notification
-        if hasattr(self, 'tray_icon'):
+        if self.tray_icon is not None:
             self.tray_icon.showMessage(
                 "Opname Voltooid",
                 f"Opname getranscribeerd: {len(final_transcription)} tekens",
-                QSystemTrayIcon.MessageIcon.Information,
+                _TRAY_INFO,
                 3000
             )
 
-        # Reindex final transcript in Qdrant (replaces live segment points for this recording)
-        if self.qdrant_enabled and self.qdrant_indexer:
-            try:
-                self.qdrant_indexer.reindex_recording(self.current_recording_id)
-                logger.info(f"Qdrant reindexed recording {self.current_recording_id}")
-            except Exception as e:
-                logger.warning(f"Qdrant reindex failed for {self.current_recording_id}: {e}")
-        elif not self._qdrant_init_done:
-            logger.warning(f"Qdrant was still initializing when recording {self.current_recording_id} finished — recording not indexed")
-
         # Notify dashboard recording ended (best effort)
         if self.dashboard_client and self.dashboard_enabled and self.current_recording_id:
             try:
-                self.dashboard_client.recording_ended(self.current_recording_id, datetime.now())
+                self.dashboard_client.recording_ended(self.current_recording_id, stopped_at or datetime.now())
             except Exception as e:
                 logger.warning(f"Dashboard recording_ended failed: {e}")
 
@@ -1680,7 +1886,29 @@ class VoiceCapture(QObject):
 
         # Reset state
         self.is_recording = False
-        self.pending_recording_name = None
+        self.is_stopping = False
+        self.pending_recording_timestamp = None
+
+    def _persist_finalized_recording(self, recording, transcription_file, final_transcription):
+        """Write the final transcript and metadata, then reindex it (recording-writer thread)"""
+        recording_id = recording["id"] if recording else None
+        try:
+            transcription_file.write_text(final_transcription, encoding='utf-8')
+        except OSError as e:
+            logger.error(f"Could not write {transcription_file}: {e}")
+        if recording is None:
+            return
+        self.recording_manager.save_recording(recording)
+
+        # Reindex final transcript in Qdrant (replaces live segment points for this recording)
+        if self.qdrant_enabled and self.qdrant_indexer:
+            try:
+                self.qdrant_indexer.reindex_recording(recording_id)
+                logger.info(f"Qdrant reindexed recording {recording_id}")
+            except Exception as e:
+                logger.warning(f"Qdrant reindex failed for {recording_id}: {e}")
+        elif not self._qdrant_init_done:
+            logger.warning(f"Qdrant was still initializing when recording {recording_id} finished — recording not indexed")
 
     def finalize_recording_no_segments(self):
         """Finalize recording when no segments were created (recording too short)"""
@@ -1689,35 +1917,45 @@ class VoiceCapture(QObject):
 
         logger.info(f"Recording {self.current_recording_id} was too short - removing recording folder")
 
-        rec_dir = self.base_recordings_dir / f"recording_{self.current_recording_id}"
-        audio_file = rec_dir / f"recording_{self.current_recording_id}.wav"
+        rec_dir = self.current_rec_dir
 
         # Get audio duration for notification
         duration = 0
-        if audio_file.exists():
-            duration = self.recording_manager.get_audio_duration(str(audio_file))
+        if self.current_audio_file and os.path.exists(self.current_audio_file):
+            duration = self.recording_manager.get_audio_duration(
+                self.current_audio_file, self.recording_manager.get_recording(self.current_recording_id))
 
         # Delete the entire recording folder since it has no transcription
-        import shutil
-        if rec_dir.exists():
-            try:
-                shutil.rmtree(rec_dir)
-                logger.info(f"Removed recording folder: {rec_dir} (duration: {duration}s)")
-            except Exception as e:
-                logger.error(f"Failed to remove recording folder {rec_dir}: {e}", exc_info=True)
+        self._discard_recording_folder(rec_dir, duration)
 
         # Show notification
-        if hasattr(self, 'tray_icon'):
+        if self.tray_icon is not None:
             self.tray_icon.showMessage(
                 "Opname Te Kort",
                 f"Opname was te kort voor transcriptie ({duration}s) en is verwijderd",
-                QSystemTrayIcon.MessageIcon.Warning,
+                _TRAY_WARNING,
                 3000
             )
 
         # Reset state
         self.is_recording = False
-        self.pending_recording_name = None
+        self.is_stopping = False
+        self.pending_recording_timestamp = None
+
+    def _discard_recording_folder(self, rec_dir, duration):
+        """Forget the current recording and delete its folder in the background"""
+        self.recording_manager.discard_recording(self.current_recording_id)
+        if not rec_dir.exists():
+            return
+
+        def remove():
+            try:
+                _fast_rmtree(rec_dir)
+                logger.info(f"Removed recording folder: {rec_dir} (duration: {duration}s)")
+            except Exception as e:
+                logger.error(f"Failed to remove recording folder {rec_dir}: {e}", exc_info=True)
+
+        threading.Thread(target=remove, name="recording-remover").start()
 
     def start_retranscription(self, recording_id):
         """Start retranscription of a recording using segments or full audio file"""
@@ -1736,27 +1974,6 @@ class VoiceCapture(QObject):
         audio_file = rec_dir / f"recording_{recording_id}.wav"
         segments_dir = rec_dir / "segments"
 
-        # Check if we should use segments or main file
-        use_segments = False
-        if not audio_file.exists() or audio_file.stat().st_size == 0:
-            # Main file doesn't exist or is empty - check for segments
-            if segments_dir.exists():
-                segment_files = sorted(segments_dir.glob("segment_*.wav"))
-                if segment_files:
-                    logger.info(f"Main audio file is missing/empty, will use {len(segment_files)} segments for retranscription")
-                    use_segments = True
-                else:
-                    logger.error(f"No segments found for recording {recording_id}")
-                    QTimer.singleShot(0, lambda: QMessageBox.warning(None, "Fout", "Geen audio bestanden gevonden voor deze opname."))
-                    return
-            else:
-                logger.error(f"Audio file not found and no segments for recording {recording_id}")
-                QTimer.singleShot(0, lambda: QMessageBox.warning(None, "Fout", "Geen audio bestanden gevonden voor deze opname."))
-                return
-
-        # Set current recording ID for retranscription
-        self.current_recording_id = recording_id
-
         # Note: notification is shown by the GUI handler (on_tray_retranscribe)
 
         # Capture MLX state at time of starting retranscription
@@ -1766,69 +1983,86 @@ class VoiceCapture(QObject):
         # Start transcription in background thread
         def retranscribe_worker():
             try:
+                # Check if we should use segments or main file (probed here, off the GUI thread)
+                use_segments = False
+                try:
+                    audio_size = audio_file.stat().st_size  # One stat for existence and size
+                except FileNotFoundError:
+                    audio_size = 0
+                if audio_size == 0:
+                    # Main file doesn't exist or is empty - check for segments
+                    if segments_dir.exists():
+                        segment_files = sorted(segments_dir.glob("segment_*.wav"))
+                        if segment_files:
+                            logger.info(f"Main audio file is missing/empty, will use {len(segment_files)} segments for retranscription")
+                            use_segments = True
+                        else:
+                            logger.error(f"No segments found for recording {recording_id}")
+                            self.retranscription_failed.emit("Geen audio bestanden gevonden voor deze opname.", False)
+                            return
+                    else:
+                        logger.error(f"Audio file not found and no segments for recording {recording_id}")
+                        self.retranscription_failed.emit("Geen audio bestanden gevonden voor deze opname.", False)
+                        return
+
                 model_name = self.selected_model_name
 
                 if use_mlx_retranscribe:
                     import mlx_whisper
-                    mlx_repo = f"mlx-community/whisper-{model_name}-mlx"
+                    mlx_repo = whisper_backend.mlx_repo(model_name)
 
-                    def transcribe_file(path):
-                        return mlx_whisper.transcribe(str(path), path_or_hf_repo=mlx_repo, verbose=False)
+                    def transcribe_audio(audio):
+                        return mlx_whisper.transcribe(audio, path_or_hf_repo=mlx_repo, verbose=False)
                 else:
                     if model_name not in self.loaded_models:
                         logger.error(f"Model {model_name} not loaded yet")
-                        QTimer.singleShot(0, lambda: QMessageBox.warning(None, "Fout", f"Model {model_name} is nog niet geladen. Probeer later opnieuw."))
+                        self.retranscription_failed.emit(f"Model {model_name} is nog niet geladen. Probeer later opnieuw.", False)
                         return
                     loaded_model = self.loaded_models[model_name]
 
-                    def transcribe_file(path):
-                        return loaded_model.transcribe(str(path), task="transcribe", fp16=False, verbose=False)
+                    def transcribe_audio(audio):
+                        if not isinstance(audio, str):
+                            audio = whisper_backend.stage_audio(audio, loaded_model)
+                        return whisper_backend.transcribe_long(loaded_model, audio)
 
                 if use_segments:
-                    logger.info(f"Retranscribing {len(segment_files)} segments with {effective_model_name} model...")
-
-                    segment_texts = []
-                    for i, segment_file in enumerate(segment_files):
-                        logger.info(f"Transcribing segment {i+1}/{len(segment_files)}: {segment_file.name}")
-
-                        # Check if segment has sufficient duration
-                        import wave
+                    # Rebuild the continuous recording from the overlapping segments and
+                    # transcribe it in one pass (no per-segment calls or overlap removal)
+                    logger.info(f"Retranscribing {len(segment_files)} segments in one pass with {effective_model_name} model...")
+                    overlap_duration = recording.get("overlap_duration", self.overlap_duration)
+                    # Segments overlap by whole recorder chunks (see AudioRecorder.start_recording)
+                    overlap_samples = self._chunk_aligned_samples(overlap_duration)
+
+                    segments = []
+                    for segment_file in segment_files:
                         try:
-                            with wave.open(str(segment_file), 'rb') as wf:
-                                frames = wf.getnframes()
-                                rate = wf.getframerate()
-                                duration = frames / float(rate)
-
-                                if duration < 0.1:
-                                    logger.warning(f"Segment {i} too short ({duration:.2f}s), skipping")
-                                    continue
-                        except Exception as e:
-                            logger.error(f"Error checking segment {i}: {e}")
-                            continue
-
-                        result = transcribe_file(segment_file)
-                        text = result["text"].strip()
-                        if text:
-                            if len(segment_texts) == 0:
-                                segment_texts.append(text)
-                            else:
-                                previous_text = segment_texts[-1]
-                                deduplicated_text = remove_overlap(previous_text, text)
-                                if deduplicated_text.strip():
-                                    segment_texts.append(deduplicated_text)
-
-                    transcription_text = " ".join(segment_texts)
+                            segments.append(load_wav_float32(segment_file))
+                        except (OSError, ValueError) as e:
+                            logger.error(f"Error reading segment {segment_file.name}: {e}")
+                    audio = stitch_segments(segments, overlap_samples)
+
+                    if len(audio) < 0.1 * WHISPER_SAMPLE_RATE:
+                        logger.warning(f"Segments of recording {recording_id} contain too little audio, skipping")
+                        transcription_text = ""
+                    else:
+                        result = transcribe_audio(audio)
+                        transcription_text = result["text"].strip()
                     logger.info(f"Retranscription complete from segments: {len(transcription_text)} chars")
                 else:
                     logger.info(f"Transcribing full audio file {audio_file} with {effective_model_name} model...")
-                    result = transcribe_file(audio_file)
+                    # Decode through a memory map instead of an ffmpeg subprocess
+                    try:
+                        audio = load_wav_float32(audio_file)
+                    except ValueError as e:
+                        logger.warning(f"Falling back to ffmpeg decode for {audio_file.name}: {e}")
+                        audio = str(audio_file)
+                    result = transcribe_audio(audio)
                     transcription_text = result["text"].strip()
                     logger.info(f"Retranscription complete: {len(transcription_text)} chars")
 
                 # Save new transcription to file
                 transcription_file = rec_dir / f"transcription_{recording_id}.txt"
-                with open(transcription_file, 'w', encoding='utf-8') as f:
-                    f.write(transcription_text)
+                transcription_file.write_text(transcription_text, encoding='utf-8')
 
                 # Update recording metadata with new transcription and model
                 self.recording_manager.update_recording(
@@ -1840,56 +2074,79 @@ class VoiceCapture(QObject):
                 logger.info(f"Updated recording {recording_id} with new transcription and model {effective_model_name}")
 
                 # Show completion notification on main thread
-                def show_completion():
-                    if hasattr(self, 'tray_icon'):
-                        self.tray_icon.showMessage(
-                            "Hertranscriptie Voltooid",
-                            f"Opname hertranscribeerd met {effective_model_name}: {len(transcription_text)} tekens",
-                            QSystemTrayIcon.MessageIcon.Information,
-                            3000
-                        )
-                QTimer.singleShot(0, show_completion)
+                self.retranscription_done.emit(effective_model_name, len(transcription_text))
 
             except Exception as e:
                 logger.error(f"Error during retranscription: {e}", exc_info=True)
                 # Use signal to show error on main thread
-                error_msg = str(e)
-                QTimer.singleShot(0, lambda: QMessageBox.critical(None, "Fout", f"Fout bij hertranscriberen: {error_msg}"))
-            finally:
-                # Reset current recording ID
-                self.current_recording_id = None
+                self.retranscription_failed.emit(f"Fout bij hertranscriberen: {e}", True)
 
-        # Start worker thread
-        thread = threading.Thread(target=retranscribe_worker)
-        thread.daemon = True
-        thread.start()
+        # Hand the job to the retranscription worker
+        self.retranscribe_queue.put(retranscribe_worker)
+
+    def on_retranscription_done(self, model_name, length):
+        """Show the retranscription result (main thread)"""
+        if self.tray_icon is not None:
+            self.tray_icon.showMessage(
+                "Hertranscriptie Voltooid",
+                f"Opname hertranscribeerd met {model_name}: {length} tekens",
+                _TRAY_INFO,
+                3000
+            )
+
+    def on_retranscription_failed(self, message, critical):
+        """Show a retranscription error reported by the worker (main thread)"""
+        if critical:
+            QMessageBox.critical(None, "Fout", message)
+        else:
+            QMessageBox.warning(None, "Fout", message)
 
     # Model loading
 
-    def load_model_async(self, model_name):
-        """Load a Whisper model asynchronously"""
-        if model_name in self.loaded_models:
+    def load_model_async(self, model_name, reload=False):
+        """Load a Whisper model asynchronously
+
+        With reload=True a loaded model is loaded again (e.g. with new settings);
+        the new instance replaces it once ready. A reload requested while the
+        model is loading starts when that load finishes.
+        """
+        if model_name in self.loaded_models and not reload:
             logger.info(f"Model {model_name} already loaded")
             return
+        if model_name in self.loading_models:
+            if reload:
+                logger.info(f"Model {model_name} is being loaded, reloading it afterwards")
+                self.pending_reloads.add(model_name)
+            else:
+                logger.info(f"Model {model_name} is already being loaded")
+            return
 
         logger.info(f"Loading Whisper model: {model_name}")
+        self.loading_models.add(model_name)
 
         def load_model():
             try:
-                # Detect best available device
-                if torch.cuda.is_available():
-                    device = "cuda"
-                elif torch.backends.mps.is_available():
-                    device = "mps"
+                # Voice activity detector is loaded alongside Whisper (cheap, reused per segment)
+                if self.vad_model is None:
+                    self.vad_model = load_vad()
+
+                if self.inference_process:
+                    from transcription_worker import RemoteWhisperModel
+                    model = RemoteWhisperModel(model_name, compile=self.torch_compile,
+                                               quantize=self.int8_quantization, cpu_threads=self.cpu_threads)
+                    device = model.device
                 else:
-                    device = "cpu"
+                    model, device = whisper_backend.load_model(model_name, compile=self.torch_compile,
+                                                               quantize=self.int8_quantization)
 
-                logger.info(f"Loading {model_name} model on {device}...")
-                model = whisper.load_model(model_name, device=device)
+                # Run one dummy pass so the first real segment does not pay for lazy init
+                whisper_backend.warm_up(model)
                 self.model_loaded.emit(model_name, model)
                 logger.info(f"Model {model_name} loaded successfully on {device}")
 
             except Exception as e:
+                self.pending_reloads.discard(model_name)
+                self.loading_models.discard(model_name)
                 logger.error(f"Error loading model {model_name}: {e}", exc_info=True)
 
         # Load in background thread
@@ -1899,18 +2156,54 @@ class VoiceCapture(QObject):
 
     def on_model_loaded(self, model_name, model):
         """Handle model loaded signal"""
+        # A reload replaces the instance that was loaded before
+        replaced = [m for m in (self.loaded_models.get(model_name),) if m is not None and m is not model]
         self.loaded_models[model_name] = model
+        self.loading_models.discard(model_name)
+        self.model_loaded_event.set()
         logger.info(f"Model {model_name} cached")
+        if replaced:
+            self._release_models(replaced)
+        # A model that finished loading after it was deselected is kept until the
+        # next selection change, so picking it again does not load it from scratch
+        self._release_unselected_models(keep=model_name)
+        if model_name in self.pending_reloads:
+            # Settings changed while it was loading: this instance still uses the old ones
+            self.pending_reloads.discard(model_name)
+            if model_name == self.selected_model_name:
+                self.load_model_async(model_name, reload=True)
 
         # Show notification
-        if hasattr(self, 'tray_icon'):
+        if self.tray_icon is not None:
             self.tray_icon.showMessage(
                 "Model Geladen",
                 f"Whisper model '{model_name}' is geladen en gereed",
-                QSystemTrayIcon.MessageIcon.Information,
+                _TRAY_INFO,
                 2000
             )
 
+    def _release_unselected_models(self, keep=None):
+        """Drop cached models other than the selected one (and keep) so their memory is freed.
+
+        Only the selected model is used for new segments; a transcription that is
+        still running on a released model keeps its own reference until it is done.
+        """
+        stale = [self.loaded_models.pop(name) for name in list(self.loaded_models)
+                 if name not in (self.selected_model_name, keep)]
+        if stale:
+            self._release_models(stale)
+
+    def _release_models(self, models):
+        """Free models that were removed from loaded_models."""
+        for model in models:
+            if hasattr(model, "close"):  # RemoteWhisperModel: stop its worker process
+                threading.Thread(target=model.close, daemon=True, name="model-release").start()
+        logger.info(f"Released {len(models)} unused Whisper model(s)")
+        # Drop the last references before collecting
+        model = None
+        models.clear()
+        whisper_backend.release_memory()
+
     def on_transcription_complete(self, result):
         """Handle transcription complete signal"""
         logger.info("Transcription complete")
@@ -1935,7 +2228,6 @@ class VoiceCapture(QObject):
             )
             return False
 
-        import os
         from dotenv import load_dotenv
         load_dotenv(dotenv_path=Path(__file__).parent / ".env", override=False)
         hf_token = os.getenv('HF_TOKEN', '').strip()
@@ -1975,11 +2267,11 @@ class VoiceCapture(QObject):
     def _process_speaker_id_queue(self, queue, index):
         """Start processing the next recording in the speaker identification queue."""
         if index >= len(queue):
-            if hasattr(self, 'tray_icon'):
+            if self.tray_icon is not None:
                 self.tray_icon.showMessage(
                     "Spreker identificatie",
                     f"{len(queue)} opname(s) verwerkt.",
-                    QSystemTrayIcon.MessageIcon.Information,
+                    _TRAY_INFO,
                     3000
                 )
             return
@@ -1988,11 +2280,11 @@ class VoiceCapture(QObject):
         recording_id = recording.get('id', '')
         name = recording.get('name', recording_id)
 
-        if hasattr(self, 'tray_icon'):
+        if self.tray_icon is not None:
             self.tray_icon.showMessage(
                 "Spreker identificatie",
                 f"Verwerken: {name}…",
-                QSystemTrayIcon.MessageIcon.Information,
+                _TRAY_INFO,
                 2000
             )
 
@@ -2190,28 +2482,17 @@ class VoiceCapture(QObject):
         """Play an audio fragment using sounddevice."""
         try:
             import sounddevice as sd
-            import wave as _wave
             import numpy as np
 
-            with _wave.open(audio_file, 'r') as wf:
-                sample_rate = wf.getframerate()
-                n_channels = wf.getnchannels()
-                sampwidth = wf.getsampwidth()
-                start_frame = int(start * sample_rate)
-                end_frame = int(end * sample_rate)
-                wf.setpos(start_frame)
-                raw = wf.readframes(end_frame - start_frame)
-
-            dtype_map = {1: np.uint8, 2: np.int16, 4: np.int32}
-            dtype = dtype_map.get(sampwidth, np.int16)
-            audio = np.frombuffer(raw, dtype=dtype).astype(np.float32)
-
-            if dtype == np.uint8:
-                audio = audio / 128.0 - 1.0
-            elif dtype == np.int16:
-                audio = audio / 32768.0
-            elif dtype == np.int32:
-                audio = audio / 2147483648.0
+            # Parse the RIFF header directly and read only the fragment's frames
+            with MappedWav(audio_file) as wav:
+                sample_rate = wav.sample_rate
+                n_channels = wav.channels
+                frame_bytes = 2 * n_channels
+                first = int(start * sample_rate) * frame_bytes
+                last = int(end * sample_rate) * frame_bytes
+                audio = np.multiply(np.frombuffer(wav.pcm[first:last], dtype=np.int16), 1.0 / 32768.0,
+                                    dtype=np.float32)
 
             if n_channels > 1:
                 audio = audio.reshape(-1, n_channels)
@@ -2234,7 +2515,6 @@ class VoiceCapture(QObject):
         Matches known speakers automatically; unknown speakers are left for Entry Point A.
         Skips silently if HF_TOKEN is not configured.
         """
-        import os
         from dotenv import load_dotenv
         load_dotenv(dotenv_path=Path(__file__).parent / ".env", override=False)
         if not os.getenv('HF_TOKEN', '').strip():
@@ -2284,13 +2564,13 @@ class VoiceCapture(QObject):
             except Exception as e:
                 logger.warning(f"Qdrant participants update failed for {rec_id}: {e}")
 
-        if results and hasattr(self, 'tray_icon'):
+        if results and self.tray_icon is not None:
             n_total = len(results)
             n_matched = len(matched)
             self.tray_icon.showMessage(
                 "Sprekers herkend",
                 f"{n_matched} van {n_total} sprekers automatisch herkend",
-                QSystemTrayIcon.MessageIcon.Information,
+                _TRAY_INFO,
                 3000
             )
 
@@ -2350,4 +2630,8 @@ def main():
 
 
 if __name__ == "__main__":
+    # Required for the spawned Whisper worker process in frozen (PyInstaller) builds
+    if getattr(sys, 'frozen', False):
+        import multiprocessing
+        multiprocessing.freeze_support()
     main()
@@ -23,7 +23,7 @@ setup_logging(enable_console=False)
 
 # Import recording manager for title updates (after logging is configured)
 from recording_manager import RecordingManager
-from transcription_utils import remove_overlap
+from transcription_utils import combine_segment_texts, read_segment_transcriptions
 
 logger = get_logger(__name__)
 
@@ -99,38 +99,16 @@ def get_transcription_text(recording_id: str) -> str | None:
     segments_dir = rec_dir / "segments"
     if segments_dir.exists():
         try:
-            # Find all transcription files in segments folder (sorted by number)
-            transcription_files = sorted(segments_dir.glob("transcription_*.txt"))
-
-            if transcription_files:
-                logger.info(f"No final transcription found for {recording_id}, combining {len(transcription_files)} segment transcriptions")
-
-                # Read all segment transcriptions
-                segment_texts = []
-                for trans_file in transcription_files:
-                    try:
-                        with open(trans_file, 'r', encoding='utf-8') as f:
-                            text = f.read().strip()
-                            if text:
-                                segment_texts.append(text)
-                    except Exception as e:
-                        logger.error(f"Failed to read {trans_file}: {e}")
+            # Read all segment transcriptions (sorted by segment number)
+            segments = read_segment_transcriptions(segments_dir)
+
+            if segments:
+                logger.info(f"No final transcription found for {recording_id}, combining {len(segments)} segment transcriptions")
 
                 # Combine all texts with overlap removal
+                segment_texts = [text for text, _ in segments if text]
                 if segment_texts:
-                    combined_texts = []
-                    for i, text in enumerate(segment_texts):
-                        if i == 0:
-                            # First segment - add as-is
-                            combined_texts.append(text)
-                        else:
-                            # Remove overlap with previous segment
-                            previous_text = combined_texts[-1]
-                            deduplicated_text = remove_overlap(previous_text, text)
-                            if deduplicated_text.strip():
-                                combined_texts.append(deduplicated_text)
-
-                    final_transcription = " ".join(combined_texts)
+                    final_transcription = combine_segment_texts(segments)
                     logger.info(f"Combined {len(segment_texts)} segment transcriptions with overlap removal ({len(final_transcription)} chars)")
                     return final_transcription
         except Exception as e:
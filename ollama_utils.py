@@ -2,34 +2,37 @@
 Ollama integration utilities for generating recording titles.
 """
 
-import json
-import urllib.request
-import urllib.error
+import httpx
 from logging_config import get_logger
 
 logger = get_logger(__name__)
 
 OLLAMA_BASE_URL = "http://localhost:11434"
 
+# Shared client: keeps connections to Ollama alive across calls and threads
+_client = httpx.Client(base_url=OLLAMA_BASE_URL)
+
+
+def get_ollama_status(timeout: int = 3) -> tuple:
+    """Return (available, model names) from a single request to the local Ollama instance."""
+    try:
+        resp = _client.get("/api/tags", timeout=timeout)
+        resp.raise_for_status()
+        data = resp.json()
+    except Exception as e:
+        logger.debug(f"Ollama not reachable: {e}")
+        return False, []
+    return True, [m["name"] for m in data.get("models", [])]
+
 
 def check_ollama_available(timeout: int = 3) -> bool:
     """Return True if the local Ollama instance is reachable."""
-    try:
-        with urllib.request.urlopen(f"{OLLAMA_BASE_URL}/api/tags", timeout=timeout) as resp:
-            return resp.status == 200
-    except Exception:
-        return False
+    return get_ollama_status(timeout)[0]
 
 
 def get_ollama_models(timeout: int = 3) -> list:
     """Return a list of model name strings from the local Ollama instance."""
-    try:
-        with urllib.request.urlopen(f"{OLLAMA_BASE_URL}/api/tags", timeout=timeout) as resp:
-            data = json.loads(resp.read().decode())
-            return [m["name"] for m in data.get("models", [])]
-    except Exception as e:
-        logger.debug(f"Could not fetch Ollama models: {e}")
-        return []
+    return get_ollama_status(timeout)[1]
 
 
 def generate_title(transcription: str, model: str, timeout: int = 300) -> str:
@@ -41,14 +44,11 @@ def generate_title(transcription: str, model: str, timeout: int = 300) -> str:
         "Geef alleen de titel, zonder aanhalingstekens of extra uitleg.\n\n"
         f"Transcriptie:\n{transcription}\n\nTitel:"
     )
-    payload = json.dumps({"model": model, "prompt": prompt, "stream": False}).encode()
-    req = urllib.request.Request(
-        f"{OLLAMA_BASE_URL}/api/generate",
-        data=payload,
-        headers={"Content-Type": "application/json"},
-        method="POST",
+    resp = _client.post(
+        "/api/generate",
+        json={"model": model, "prompt": prompt, "stream": False},
+        timeout=timeout,
     )
-    with urllib.request.urlopen(req, timeout=timeout) as resp:
-        data = json.loads(resp.read().decode())
-        title = data.get("response", "").strip().strip("\"'")
-        return title
+    resp.raise_for_status()
+    title = resp.json().get("response", "").strip().strip("\"'")
+    return title
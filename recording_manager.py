@@ -4,13 +4,27 @@ Manages recording metadata and storage with subfolder structure
 """
 
 import json
-import wave
+import os
+import threading
 from datetime import datetime, timedelta
 from pathlib import Path
 from logging_config import get_logger
+from audio_utils import wav_duration
 
 logger = get_logger(__name__)
 
+# Header size of the PCM WAV files written by AudioRecorder (wave module)
+WAV_HEADER_BYTES = 44
+
+# Written in a recording folder while its JSON file does not exist yet, so a
+# recording interrupted by a crash is still listed (and can be retranscribed)
+IN_PROGRESS_MARKER = "inprogress.marker"
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 def seconds_to_iso_duration(seconds):
     """Convert seconds to ISO 8601 duration format (e.g., PT1M30S)"""
@@ -60,6 +74,49 @@ def iso_duration_to_seconds(iso_duration):
     return hours * 3600 + minutes * 60 + seconds
 
 
+def _format_recording_date(timestamp):
+    """Format a YYYYMMDD_HHMMSS recording id as 'YYYY-MM-DD HH:MM:SS'"""
+    t = timestamp
+    # Recording ids come from strftime, so slicing is enough; strptime handles anything else
+    if len(t) == 15 and t[8] == '_' and t.isascii() and t[:8].isdigit() and t[9:].isdigit():
+        return f"{t[0:4]}-{t[4:6]}-{t[6:8]} {t[9:11]}:{t[11:13]}:{t[13:15]}"
+    return datetime.strptime(t, "%Y%m%d_%H%M%S").strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _interrupted_recording(rec_dir):
+    """Minimal metadata for a recording folder that only has an in-progress marker"""
+    timestamp = rec_dir.name[len('recording_'):]
+    return {
+        "id": timestamp,
+        "audio_file": str(rec_dir / f"{rec_dir.name}.wav"),
+        "name": f"Opname {timestamp} (onderbroken)",
+        "date": _format_recording_date(timestamp),
+        "transcription": "",
+        "summary": "",
+        "model": "",
+        "interrupted": True,
+    }
+
+
+def _has_segment_audio(segments_dir):
+    """True when segments_dir contains at least one segment_*.wav"""
+    try:
+        with os.scandir(segments_dir) as it:
+            return any(e.name.startswith('segment_') and e.name.endswith('.wav') for e in it)
+    except FileNotFoundError:
+        return False
+
+
+def _encode_recording(recording):
+    """Serialize a recording as indented UTF-8 JSON (orjson when installed)"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(recording, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            pass  # e.g. numpy scalars in speaker data: let the json module handle them
+    return json.dumps(recording, indent=2, ensure_ascii=False).encode('utf-8')
+
+
 class RecordingManager:
     """Manages recording metadata and storage"""
 
@@ -71,11 +128,21 @@ class RecordingManager:
             self.recordings_dir = Path(recordings_dir)
 
         self.recordings = []
+        self._by_id = {}  # {recording_id: recording}, same objects as self.recordings
+        self._json_cache = {}  # {json path: ((mtime_ns, size), recording)} for incremental reloads
+        self._unsaved = {}  # {recording_id: recording} added in memory but not yet written to disk
+        self._save_lock = threading.Lock()  # Recordings are saved from the GUI and worker threads
         self.load_recordings()
 
     def load_recordings(self):
-        """Load recordings from individual JSON files in subfolders"""
+        """Load recordings from individual JSON files in subfolders
+
+        Only JSON files that changed (mtime/size) since the previous load are parsed again.
+        Folders without a JSON file but with an in-progress marker are listed as
+        interrupted recordings.
+        """
         self.recordings = []
+        json_cache = {}
 
         try:
             # Create recordings directory if it doesn't exist
@@ -89,23 +156,77 @@ class RecordingManager:
             )
 
             # Load each recording's JSON file
+            parsed = 0
             for rec_dir in recording_dirs:
                 json_file = rec_dir / f"{rec_dir.name}.json"
-
-                if json_file.exists():
+                try:
+                    st = json_file.stat()
+                except FileNotFoundError:
+                    # No metadata yet: recording in progress here, or interrupted
+                    if rec_dir.name[len('recording_'):] in self._unsaved:
+                        continue
+                    json_file = rec_dir / IN_PROGRESS_MARKER
+                    try:
+                        st = json_file.stat()
+                    except FileNotFoundError:
+                        continue
+
+                key = str(json_file)
+                signature = (st.st_mtime_ns, st.st_size)
+                cached = self._json_cache.get(key)
+                if cached and cached[0] == signature:
+                    recording = cached[1]
+                elif json_file.name == IN_PROGRESS_MARKER:
+                    recording = _interrupted_recording(rec_dir)
+                else:
                     try:
                         with open(json_file, 'r', encoding='utf-8') as f:
                             recording = json.load(f)
-                            self.recordings.append(recording)
+                        parsed += 1
                     except Exception as e:
                         logger.error(f"Error loading recording from {json_file}: {e}", exc_info=True)
+                        continue
+                json_cache[key] = (signature, recording)
+                self.recordings.append(recording)
 
-            logger.debug(f"Loaded {len(self.recordings)} recordings from subfolders")
+            logger.debug(f"Loaded {len(self.recordings)} recordings from subfolders ({parsed} parsed)")
 
         except Exception as e:
             logger.error(f"Error loading recordings: {e}", exc_info=True)
             self.recordings = []
 
+        # Recordings that disappeared from disk drop out of the cache
+        self._json_cache = json_cache
+
+        # Keep in-progress recordings that have no JSON file yet (or are still being written)
+        loaded_ids = {rec.get("id") for rec in self.recordings}
+        for recording in list(self._unsaved.values()):
+            if recording["id"] not in loaded_ids:
+                self.recordings.insert(0, recording)
+
+        self._by_id = {rec.get("id"): rec for rec in self.recordings}
+
+    def recording_ids_with_audio(self):
+        """Return the set of recording ids whose folder contains recording_<id>.wav
+
+        Interrupted recordings (in-progress marker, no final WAV) count when
+        segment WAVs were saved, since retranscription can rebuild from those.
+        """
+        ids = set()
+        try:
+            with os.scandir(self.recordings_dir) as it:
+                for entry in it:
+                    name = entry.name
+                    if not (name.startswith('recording_') and entry.is_dir()):
+                        continue
+                    if (os.path.exists(os.path.join(entry.path, f"{name}.wav"))
+                            or (os.path.exists(os.path.join(entry.path, IN_PROGRESS_MARKER))
+                                and _has_segment_audio(os.path.join(entry.path, "segments")))):
+                        ids.add(name[len('recording_'):])
+        except FileNotFoundError:
+            pass
+        return ids
+
     def save_recording(self, recording):
         """Save a single recording to its JSON file"""
         try:
@@ -114,21 +235,38 @@ class RecordingManager:
             rec_dir.mkdir(parents=True, exist_ok=True)
 
             json_file = rec_dir / f"recording_{timestamp}.json"
-            with open(json_file, 'w', encoding='utf-8') as f:
-                json.dump(recording, f, indent=2, ensure_ascii=False)
+            with self._save_lock:
+                # Encode under the lock too: a snapshot taken before a concurrent
+                # save must not be written after (and over) the newer one
+                data = _encode_recording(recording)
+                # Write next to the target and rename, so readers never see a partial file
+                tmp_file = json_file.with_suffix('.json.tmp')
+                tmp_file.write_bytes(data)
+                os.replace(tmp_file, json_file)
+                if self._unsaved.pop(timestamp, None) is not None or recording.get("interrupted"):
+                    # The JSON file now lists the recording
+                    (rec_dir / IN_PROGRESS_MARKER).unlink(missing_ok=True)
 
             logger.debug(f"Saved recording to {json_file}")
         except Exception as e:
             logger.error(f"Error saving recording: {e}", exc_info=True)
 
     def add_recording(self, audio_file, timestamp, name=None, transcription="", summary="", duration=None, model="",
-                      segment_duration=30, overlap_duration=15):
-        """Add a new recording with all settings"""
+                      segment_duration=30, overlap_duration=15, save=True,
+                      sample_rate=None, channels=None, sample_width=None):
+        """Add a new recording with all settings
+
+        With save=False the recording is only kept in memory until the first
+        update_recording/save_recording writes it (used while recording); an
+        empty in-progress marker in its folder keeps it listed after a crash.
+        The audio format (sample_rate, channels, sample_width in bytes) is
+        stored when given, so the duration can later be derived from the file size.
+        """
         recording = {
             "id": timestamp,
             "audio_file": audio_file,
             "name": name or f"Opname {timestamp}",
-            "date": datetime.strptime(timestamp, "%Y%m%d_%H%M%S").strftime("%Y-%m-%d %H:%M:%S"),
+            "date": _format_recording_date(timestamp),
             "transcription": transcription,
             "summary": summary,
             "model": model,  # Whisper model used for transcription
@@ -139,46 +277,72 @@ class RecordingManager:
         # Only add duration if it's provided (not None)
         if duration is not None:
             recording["duration"] = seconds_to_iso_duration(duration)  # Duration in ISO 8601 format
+        if sample_rate and channels and sample_width:
+            recording["sample_rate"] = sample_rate
+            recording["channels"] = channels
+            recording["sample_width"] = sample_width
 
         self.recordings.insert(0, recording)  # Add to beginning
-        self.save_recording(recording)
+        self._by_id[timestamp] = recording
+        if save:
+            self.save_recording(recording)
+        else:
+            self._unsaved[timestamp] = recording
+            try:
+                rec_dir = self.recordings_dir / f"recording_{timestamp}"
+                rec_dir.mkdir(parents=True, exist_ok=True)
+                (rec_dir / IN_PROGRESS_MARKER).touch()
+            except OSError as e:
+                logger.error(f"Could not write in-progress marker for recording {timestamp}: {e}")
         return recording
 
-    def get_audio_duration(self, audio_file):
-        """Get duration of audio file in seconds"""
+    def discard_recording(self, recording_id):
+        """Forget a recording in memory (e.g. after its folder was removed)"""
+        self._unsaved.pop(recording_id, None)
+        rec = self._by_id.pop(recording_id, None)
+        if rec is not None:
+            self.recordings.remove(rec)
+
+    def get_audio_duration(self, audio_file, recording=None):
+        """Get duration of audio file in seconds
+
+        For a recording that stores its audio format this is a single stat;
+        otherwise the WAV header is read.
+        """
         try:
-            with wave.open(audio_file, 'rb') as wf:
-                frames = wf.getnframes()
-                rate = wf.getframerate()
-                duration = frames / float(rate)
-                return int(duration)
+            if recording and "sample_rate" in recording:
+                byte_rate = recording["sample_rate"] * recording["channels"] * recording["sample_width"]
+                return int(max(0, os.stat(audio_file).st_size - WAV_HEADER_BYTES) / byte_rate)
+            return int(wav_duration(audio_file))
         except Exception as e:
             logger.error(f"Error getting audio duration: {e}", exc_info=True)
             return 0
 
-    def update_recording(self, recording_id, **kwargs):
-        """Update recording data"""
-        for rec in self.recordings:
-            if rec["id"] == recording_id:
-                # Convert duration to ISO format if it's provided as seconds
-                if 'duration' in kwargs and isinstance(kwargs['duration'], (int, float)):
-                    kwargs['duration'] = seconds_to_iso_duration(kwargs['duration'])
-                rec.update(kwargs)
+    def update_recording(self, recording_id, save=True, **kwargs):
+        """Update recording data and return the updated recording (None if unknown)
+
+        With save=False only the in-memory recording is updated; the caller
+        writes it later with save_recording.
+        """
+        rec = self._by_id.get(recording_id)
+        if rec is not None:
+            # Convert duration to ISO format if it's provided as seconds
+            if 'duration' in kwargs and isinstance(kwargs['duration'], (int, float)):
+                kwargs['duration'] = seconds_to_iso_duration(kwargs['duration'])
+            rec.update(kwargs)
+            if save:
                 self.save_recording(rec)
-                break
+        return rec
 
     def get_recording(self, recording_id):
         """Get recording by ID"""
-        for rec in self.recordings:
-            if rec["id"] == recording_id:
-                return rec
-        return None
+        return self._by_id.get(recording_id)
 
     def update_recording_title(self, recording_id, new_title):
         """Update the title/name of a recording"""
-        for rec in self.recordings:
-            if rec["id"] == recording_id:
-                rec["name"] = new_title
-                self.save_recording(rec)
-                return True
-        return False
+        rec = self._by_id.get(recording_id)
+        if rec is None:
+            return False
+        rec["name"] = new_title
+        self.save_recording(rec)
+        return True
@@ -13,6 +13,7 @@ import whisper
 from dotenv import load_dotenv
 
 from recording_manager import RecordingManager, iso_duration_to_seconds
+from audio_utils import load_audio_float32
 from logging_config import setup_logging, get_logger
 
 # Load environment variables
@@ -415,6 +416,9 @@ def retranscribe_recording(args):
     # Check if using MLX Whisper
     use_mlx = model_name.startswith('mlx-')
 
+    # Decode the recording once in-process instead of via an ffmpeg subprocess per call
+    audio = load_audio_float32(audio_file)
+
     if use_mlx:
         # MLX Whisper path
         try:
@@ -433,7 +437,7 @@ def retranscribe_recording(args):
             # MLX Whisper transcription
             # MLX supports word_timestamps and works well on Apple Silicon/MPS
             result = mlx_whisper.transcribe(
-                str(audio_file),
+                audio,
                 path_or_hf_repo=f"mlx-community/whisper-{mlx_model_size}-mlx",
 
                 word_timestamps=use_diarization,
@@ -470,7 +474,7 @@ def retranscribe_recording(args):
                 # Reload model on CPU for word timestamp support
                 model_cpu = whisper.load_model(model_name, device="cpu")
                 result = model_cpu.transcribe(
-                    str(audio_file),
+                    audio,
     
                     task="transcribe",
                     fp16=False,
@@ -479,7 +483,7 @@ def retranscribe_recording(args):
                 )
             else:
                 result = model.transcribe(
-                    str(audio_file),
+                    audio,
     
                     task="transcribe",
                     fp16=False,  # Avoid NaN on MPS
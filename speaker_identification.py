@@ -117,7 +117,7 @@ def _get_audio_duration(audio_file):
     try:
         with wave.open(str(audio_file), 'r') as wf:
             return wf.getnframes() / wf.getframerate()
-    except Exception:
+    except (OSError, EOFError, wave.Error):
         return 0.0
 
 
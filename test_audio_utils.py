@@ -0,0 +1,146 @@
+"""
+Tests for the WAV and segment helpers in audio_utils
+"""
+
+import struct
+import sys
+
+import numpy as np
+import pytest
+
+from audio_utils import (
+    chunk_aligned_samples, is_silent_pcm, parse_wav_header, pcm16_to_float32, pcm_rms, resample_to_16k,
+    stitch_segments, wav_duration, WHISPER_SAMPLE_RATE,
+)
+
+# AudioRecorder defaults
+RATE = 16000
+CHUNK = 4096
+SEGMENT_DURATION = 10
+OVERLAP_DURATION = 5
+
+
+def _wav_bytes(pcm, sample_rate=16000, channels=1, bits=16, format_tag=1, extra_chunks=b""):
+    fmt = struct.pack('<HHIIHH', format_tag, channels, sample_rate,
+                      sample_rate * channels * bits // 8, channels * bits // 8, bits)
+    body = (b'WAVE' + b'fmt ' + struct.pack('<I', len(fmt)) + fmt + extra_chunks
+            + b'data' + struct.pack('<I', len(pcm)) + pcm)
+    return b'RIFF' + struct.pack('<I', len(body)) + body
+
+
+def _record_segments(samples, rate=RATE, chunk=CHUNK):
+    """Cut samples into overlapping segments exactly like AudioRecorder's record loop."""
+    frames_per_segment = int(rate * SEGMENT_DURATION / chunk)
+    frames_for_overlap = int(rate * OVERLAP_DURATION / chunk)
+    frames, segments = [], []
+    for start in range(0, len(samples) - chunk + 1, chunk):
+        frames.append(samples[start:start + chunk])
+        if len(frames) >= frames_per_segment:
+            segments.append(np.concatenate(frames[:frames_per_segment]))
+            frames = frames[frames_per_segment - frames_for_overlap:]
+    return segments
+
+
+def test_parse_wav_header_plain():
+    pcm = b'\x01\x00' * 100
+    offset, size, sample_rate, channels = parse_wav_header(_wav_bytes(pcm))
+    assert (offset, size, sample_rate, channels) == (44, 200, 16000, 1)
+
+
+def test_parse_wav_header_skips_unknown_chunks():
+    extra = b'LIST' + struct.pack('<I', 3) + b'abc' + b'\x00'  # odd size is padded
+    data = _wav_bytes(b'\x00\x00' * 10, sample_rate=48000, channels=2, extra_chunks=extra)
+    offset, size, sample_rate, channels = parse_wav_header(data)
+    assert offset == 44 + 12
+    assert (size, sample_rate, channels) == (20, 48000, 2)
+
+
+def test_parse_wav_header_clamps_to_file_size():
+    data = _wav_bytes(b'\x00\x00' * 10)
+    # Header claims 20 bytes, but only 7 are present: clamp to whole frames
+    offset, size, _, _ = parse_wav_header(data[:44 + 7])
+    assert (offset, size) == (44, 6)
+    # With only the header buffered, file_size bounds the data chunk
+    _, size, _, _ = parse_wav_header(data[:44], file_size=44 + 10)
+    assert size == 10
+
+
+@pytest.mark.parametrize("data", [
+    b'',
+    b'RIFX' + b'\x00' * 40,
+    _wav_bytes(b'\x00' * 12, bits=24),
+    _wav_bytes(b'\x00' * 8, format_tag=3, bits=32),
+])
+def test_parse_wav_header_rejects_unsupported(data):
+    with pytest.raises(ValueError):
+        parse_wav_header(data)
+
+
+def test_wav_duration_from_header(tmp_path):
+    path = tmp_path / "a.wav"
+    path.write_bytes(_wav_bytes(b'\x00\x00' * 8000, sample_rate=16000))
+    assert wav_duration(path) == pytest.approx(0.5)
+
+
+def test_chunk_aligned_samples_matches_recorder():
+    assert chunk_aligned_samples(SEGMENT_DURATION, RATE, CHUNK) == 39 * CHUNK
+    assert chunk_aligned_samples(OVERLAP_DURATION, RATE, CHUNK) == 19 * CHUNK
+    # Other recorder rates are expressed in 16 kHz samples
+    assert chunk_aligned_samples(OVERLAP_DURATION, 48000, CHUNK) == 58 * CHUNK * WHISPER_SAMPLE_RATE // 48000
+
+
+def test_stitch_segments_round_trip():
+    samples = np.arange(RATE * 40, dtype=np.float32)
+    segments = _record_segments(samples)
+    assert len(segments) > 2
+
+    overlap = chunk_aligned_samples(OVERLAP_DURATION, RATE, CHUNK)
+    stitched = stitch_segments(segments, overlap)
+
+    segment_len = chunk_aligned_samples(SEGMENT_DURATION, RATE, CHUNK)
+    step = segment_len - overlap
+    assert len(stitched) == segment_len + step * (len(segments) - 1)
+    np.testing.assert_array_equal(stitched, samples[:len(stitched)])
+
+
+def test_stitch_segments_edge_cases():
+    assert stitch_segments([], 10).size == 0
+    single = np.ones(5, dtype=np.float32)
+    np.testing.assert_array_equal(stitch_segments([single], 3), single)
+
+
+def test_resample_to_16k_matches_resample_poly():
+    signal = pytest.importorskip("scipy.signal")
+    t = np.arange(48000, dtype=np.float32) / 48000
+    samples = (0.5 * np.sin(2 * np.pi * 440 * t) + 0.1 * np.sin(2 * np.pi * 12000 * t)).astype(np.float32)
+
+    resampled = resample_to_16k(samples, 48000)
+    assert resampled.dtype == np.float32
+    np.testing.assert_allclose(resampled, signal.resample_poly(samples, 1, 3), atol=1e-6)
+    # 16 kHz input is returned as-is
+    assert resample_to_16k(resampled, WHISPER_SAMPLE_RATE) is resampled
+
+
+def test_resample_to_16k_without_scipy(monkeypatch):
+    monkeypatch.setitem(sys.modules, "scipy.signal", None)
+    with pytest.raises(ValueError):
+        resample_to_16k(np.zeros(480, dtype=np.float32), 48000)
+
+
+def test_pcm16_to_float32_scales_and_downmixes():
+    pcm = np.array([16384, -16384, -32768, 0], dtype=np.int16).tobytes()
+    np.testing.assert_array_equal(pcm16_to_float32(pcm, 16000, 1), [0.5, -0.5, -1.0, 0.0])
+    # Interleaved stereo frames are averaged to mono
+    np.testing.assert_array_equal(pcm16_to_float32(pcm, 16000, 2), [0.0, -0.5])
+
+
+def test_energy_vad_only_skips_near_digital_silence():
+    t = np.arange(RATE, dtype=np.float32) / RATE
+    quiet_speech = (100 * np.sin(2 * np.pi * 200 * t)).astype(np.int16).tobytes()  # about -50 dBFS
+    hiss = np.random.default_rng(0).integers(-20, 21, RATE).astype(np.int16).tobytes()
+
+    assert pcm_rms(quiet_speech) == pytest.approx(100 / np.sqrt(2), rel=0.01)
+    assert not is_silent_pcm(quiet_speech, RATE, 1)
+    assert is_silent_pcm(hiss, RATE, 1)
+    assert is_silent_pcm(b"\x00\x00" * RATE, RATE, 1)
+    assert pcm_rms(b"") == 0.0
@@ -0,0 +1,84 @@
+"""
+Tests for RecordingManager's incremental JSON loading, interrupted recordings and duration probing
+"""
+
+import json
+import os
+import struct
+
+from recording_manager import IN_PROGRESS_MARKER, RecordingManager
+
+
+def _write_recording(base_dir, recording_id, **fields):
+    rec_dir = base_dir / f"recording_{recording_id}"
+    rec_dir.mkdir(exist_ok=True)
+    json_file = rec_dir / f"recording_{recording_id}.json"
+    json_file.write_text(json.dumps({"id": recording_id, **fields}), encoding="utf-8")
+    return json_file
+
+
+def test_unchanged_recordings_are_not_parsed_again(tmp_path):
+    _write_recording(tmp_path, "20240101_100000", name="A")
+    _write_recording(tmp_path, "20240102_100000", name="B")
+    manager = RecordingManager(tmp_path)
+    before = {rec["id"]: rec for rec in manager.recordings}
+
+    manager.load_recordings()
+    after = {rec["id"]: rec for rec in manager.recordings}
+    assert all(after[rid] is before[rid] for rid in before)
+    # Most recent first
+    assert [rec["id"] for rec in manager.recordings] == ["20240102_100000", "20240101_100000"]
+
+
+def test_changed_and_removed_recordings_are_picked_up(tmp_path):
+    json_a = _write_recording(tmp_path, "20240101_100000", name="A")
+    json_b = _write_recording(tmp_path, "20240102_100000", name="B")
+    manager = RecordingManager(tmp_path)
+
+    json_a.write_text(json.dumps({"id": "20240101_100000", "name": "A (nieuw)"}), encoding="utf-8")
+    st = json_a.stat()
+    os.utime(json_a, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    json_b.unlink()
+
+    manager.load_recordings()
+    assert [rec["name"] for rec in manager.recordings] == ["A (nieuw)"]
+    assert manager.get_recording("20240102_100000") is None
+    assert list(manager._json_cache) == [str(json_a)]
+
+
+def test_get_audio_duration_from_file_size(tmp_path):
+    manager = RecordingManager(tmp_path)
+    wav = tmp_path / "a.wav"
+    pcm = b"\x00\x00" * 16000 * 3
+    fmt = struct.pack('<HHIIHH', 1, 1, 16000, 32000, 2, 16)
+    body = b'WAVE' + b'fmt ' + struct.pack('<I', len(fmt)) + fmt + b'data' + struct.pack('<I', len(pcm)) + pcm
+    wav.write_bytes(b'RIFF' + struct.pack('<I', len(body)) + body)
+
+    recording = {"sample_rate": 16000, "channels": 1, "sample_width": 2}
+    assert manager.get_audio_duration(wav, recording) == 3
+    # Without the stored format the WAV header is parsed
+    assert manager.get_audio_duration(wav) == 3
+    assert manager.get_audio_duration(tmp_path / "missing.wav") == 0
+
+
+def test_interrupted_recording_is_listed_until_saved(tmp_path):
+    manager = RecordingManager(tmp_path)
+    manager.add_recording("a.wav", "20240101_100000", save=False)
+    rec_dir = tmp_path / "recording_20240101_100000"
+    assert (rec_dir / IN_PROGRESS_MARKER).exists()
+    # Still in progress in this process: listed once
+    manager.load_recordings()
+    assert [rec["id"] for rec in manager.recordings] == ["20240101_100000"]
+
+    # After a crash a new manager lists it from the marker
+    (rec_dir / "segments").mkdir()
+    assert RecordingManager(tmp_path).recording_ids_with_audio() == set()
+    (rec_dir / "segments" / "segment_001.wav").write_bytes(b"")
+    restarted = RecordingManager(tmp_path)
+    assert restarted.get_recording("20240101_100000")["interrupted"] is True
+    assert restarted.recording_ids_with_audio() == {"20240101_100000"}
+
+    restarted.update_recording("20240101_100000", transcription="tekst")
+    assert not (rec_dir / IN_PROGRESS_MARKER).exists()
+    restarted.load_recordings()
+    assert restarted.get_recording("20240101_100000")["transcription"] == "tekst"
@@ -0,0 +1,78 @@
+"""
+Tests for the segment text helpers in transcription_utils
+"""
+
+import os
+
+from transcription_utils import (
+    combine_segment_texts, overlap_free_marker, read_segment_transcriptions, remove_overlap,
+    segment_transcription_files,
+)
+
+
+def test_remove_overlap_exact():
+    previous = "we gaan het hebben over de planning voor volgende week"
+    new = "de planning voor volgende week en daarna het budget"
+    assert remove_overlap(previous, new) == "en daarna het budget"
+
+
+def test_remove_overlap_is_case_insensitive():
+    assert remove_overlap("Dit is de Planning", "de planning is klaar") == "is klaar"
+
+
+def test_remove_overlap_tolerates_small_differences():
+    # 7 of 9 overlapping words match (78% >= 70%)
+    previous = "een twee drie vier vijf zes zeven acht negen"
+    new = "een twee drei vier vijf zes zevn acht negen tien"
+    assert remove_overlap(previous, new) == "tien"
+
+
+def test_remove_overlap_prefers_longest_match():
+    previous = "a b a b"
+    new = "a b a b c"
+    assert remove_overlap(previous, new) == "c"
+
+
+def test_remove_overlap_without_overlap():
+    new = "iets heel anders"
+    assert remove_overlap("geen gemeenschappelijke woorden hier", new) == new
+
+
+def test_remove_overlap_empty_inputs():
+    assert remove_overlap("", "nieuwe tekst") == "nieuwe tekst"
+    assert remove_overlap("vorige tekst", "") == ""
+
+
+def test_remove_overlap_window_is_limited_to_50_words():
+    previous = " ".join(f"w{i}" for i in range(100))
+    new = " ".join(f"w{i}" for i in range(40, 100)) + " einde"
+    # The 60-word overlap exceeds the 50-word window, so it is not found
+    assert remove_overlap(previous, new) == new
+
+
+def test_segment_transcription_files_numeric_order(tmp_path):
+    for name in ("transcription_10.txt", "transcription_2.txt", "transcription_1.txt",
+                 "transcription_x.txt", "segment_001.wav"):
+        (tmp_path / name).write_text("", encoding="utf-8")
+    names = [os.path.basename(path) for path in segment_transcription_files(tmp_path)]
+    assert names == ["transcription_1.txt", "transcription_2.txt", "transcription_10.txt"]
+
+
+def test_combine_segment_texts_skips_overlap_removal_for_overlap_free_texts():
+    segments = [
+        ("de planning voor volgende week", False),
+        ("volgende week en het budget", False),
+        ("", False),
+        # Already excludes the overlap: its leading words are new speech
+        ("het budget is rond", True),
+    ]
+    assert combine_segment_texts(segments) == (
+        "de planning voor volgende week en het budget het budget is rond")
+
+
+def test_read_segment_transcriptions_reads_overlap_free_markers(tmp_path):
+    (tmp_path / "transcription_1.txt").write_text(" een twee ", encoding="utf-8")
+    second = tmp_path / "transcription_2.txt"
+    second.write_text("drie", encoding="utf-8")
+    open(overlap_free_marker(second), "w").close()
+    assert read_segment_transcriptions(tmp_path) == [("een twee", False), ("drie", True)]
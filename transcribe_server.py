@@ -24,7 +24,6 @@ from typing import Dict, Optional
 
 from fastapi import FastAPI, UploadFile, File, Form, Header, HTTPException, Depends
 from pydantic import BaseModel, Field
-import uvicorn
 
 from logging_config import get_logger, setup_logging
 
@@ -191,12 +190,16 @@ def _run_transcription(job_id: str) -> None:
         text = ""
         backend = None
 
+        # Decode once (ffmpeg only for non-WAV uploads) and share it between backends
+        from audio_utils import load_audio_float32
+        audio = load_audio_float32(file_path)
+
         # Default route: MLX Whisper
         try:
             import mlx_whisper
 
             result = mlx_whisper.transcribe(
-                str(file_path),
+                audio,
                 path_or_hf_repo=f"mlx-community/whisper-{job.model}-mlx",
                 verbose=False,
             )
@@ -211,7 +214,7 @@ def _run_transcription(job_id: str) -> None:
 
             device = _detect_device()
             model = whisper.load_model(job.model, device=device)
-            result = model.transcribe(str(file_path), task="transcribe", fp16=False, verbose=False)
+            result = model.transcribe(audio, task="transcribe", fp16=False, verbose=False)
             text = (result.get("text") or "").strip()
             backend = f"whisper:{job.model}@{device}"
 
@@ -342,6 +345,8 @@ def start_transcribe_server_in_background(host: str = "127.0.0.1", port: int = T
 
     def _run():
         try:
+            # Imported here so the app embedding this server does not pay for it at startup
+            import uvicorn
             config = uvicorn.Config(app, host=host, port=port, log_level="warning")
             server = uvicorn.Server(config)
             server.run()
@@ -354,6 +359,8 @@ def start_transcribe_server_in_background(host: str = "127.0.0.1", port: int = T
 
 
 def main():
+    import uvicorn
+
     setup_logging()
     logger.info(f"Starting standalone transcribe server on 127.0.0.1:{TRANSCRIBE_API_PORT}")
     uvicorn.run(app, host="127.0.0.1", port=TRANSCRIBE_API_PORT, log_level="info")
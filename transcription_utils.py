@@ -3,6 +3,8 @@ Transcription Utilities
 Shared functions for transcription processing
 """
 
+import math
+import os
 from logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -10,6 +12,70 @@ logger = get_logger(__name__)
 
 WHISPER_SILENCE_HALLUCINATIONS = {"Thank you.", "you", "You"}
 
+SEGMENT_TRANSCRIPTION_PREFIX = "transcription_"
+SEGMENT_TRANSCRIPTION_SUFFIX = ".txt"
+# Empty marker next to transcription_N.txt: the text was split from a stitched
+# multi-segment Whisper call and already excludes the overlap with segment N-1
+OVERLAP_FREE_MARKER_SUFFIX = ".overlap_free"
+
+
+def segment_transcription_files(segments_dir):
+    """Return the paths of the segment transcription files in segment order.
+
+    Sorted on the segment number (transcription_10.txt comes after transcription_2.txt).
+    """
+    prefix, suffix = SEGMENT_TRANSCRIPTION_PREFIX, SEGMENT_TRANSCRIPTION_SUFFIX
+    numbered = []
+    with os.scandir(segments_dir) as it:
+        for entry in it:
+            name = entry.name
+            if name.startswith(prefix) and name.endswith(suffix):
+                number = name[len(prefix):-len(suffix)]
+                if number.isdigit():
+                    numbered.append((int(number), entry.path))
+    numbered.sort()
+    return [path for _, path in numbered]
+
+
+def overlap_free_marker(transcription_file):
+    """Path of the marker that flags a segment transcription file as overlap-free."""
+    root, _ = os.path.splitext(str(transcription_file))
+    return root + OVERLAP_FREE_MARKER_SUFFIX
+
+
+def read_segment_transcriptions(segments_dir):
+    """Read the segment transcriptions in segment order as (text, overlap_free) pairs."""
+    segments = []
+    for trans_file in segment_transcription_files(segments_dir):
+        try:
+            with open(trans_file, 'r', encoding='utf-8') as f:
+                text = f.read().strip()
+        except Exception as e:
+            logger.error(f"Failed to read {trans_file}: {e}")
+            continue
+        segments.append((text, os.path.exists(overlap_free_marker(trans_file))))
+    return segments
+
+
+def combine_segment_texts(segments):
+    """Join (text, overlap_free) segment transcriptions into one transcript.
+
+    Overlap with the previous text is removed, except for overlap-free texts
+    whose overlap audio was never transcribed for them.
+    """
+    combined_texts = []
+    for text, overlap_free in segments:
+        text = text.strip()
+        if not text:
+            continue
+        if combined_texts and not overlap_free:
+            # Remove overlap with previous segment
+            text = remove_overlap(combined_texts[-1], text)
+            if not text.strip():
+                continue
+        combined_texts.append(text)
+    return " ".join(combined_texts)
+
 
 def is_empty_segment(text: str) -> bool:
     """Return True if a transcription segment contains no real content.
@@ -31,15 +97,27 @@ def remove_overlap(previous_text: str, new_text: str) -> str:
 
     max_overlap = min(50, len(prev_words), len(new_words))
 
+    # Lowercase the candidate window once instead of on every comparison
+    prev_tail_all = [w.lower() for w in prev_words[len(prev_words) - max_overlap:]]
+    new_head_all = [w.lower() for w in new_words[:max_overlap]]
+
     best_overlap_length = 0
     for overlap_len in range(max_overlap, 0, -1):
-        prev_tail = prev_words[-overlap_len:]
-        new_head = new_words[:overlap_len]
-
-        matches = sum(1 for p, n in zip(prev_tail, new_head) if p.lower() == n.lower())
-        similarity = matches / overlap_len
-
-        if similarity >= 0.7:
+        # Each length aligns a different tail with the head, so compare per length,
+        # but stop as soon as too many mismatches rule out 70% similarity
+        allowed_mismatches = overlap_len - math.ceil(0.7 * overlap_len - 1e-9)
+        offset = max_overlap - overlap_len
+        matches = 0
+        mismatches = 0
+        for i in range(overlap_len):
+            if prev_tail_all[offset + i] == new_head_all[i]:
+                matches += 1
+            else:
+                mismatches += 1
+                if mismatches > allowed_mismatches:
+                    break
+        else:
+            similarity = matches / overlap_len
             best_overlap_length = overlap_len
             logger.debug(f"Found overlap of {overlap_len} words with {similarity:.1%} similarity")
             break
@@ -0,0 +1,162 @@
+"""
+Transcription Worker Module
+Runs Whisper inference in a separate process so the GUI process keeps the GIL
+and survives model crashes (e.g. out-of-memory on the large model)
+"""
+
+import multiprocessing
+import queue
+import threading
+from multiprocessing import shared_memory
+
+import numpy as np
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Seconds between liveness checks while waiting for the worker process
+RESULT_POLL_INTERVAL = 1.0
+
+
+def _attach_shared_audio(shm_name, n_samples):
+    """Copy a float32 audio buffer out of shared memory created by the parent."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        return np.ndarray((n_samples,), dtype=np.float32, buffer=shm.buf).copy()
+    finally:
+        shm.close()
+
+
+def _worker_main(model_name, compile, quantize, cpu_threads, requests, results):
+    """Worker process entry point: load the model once, then serve transcription requests."""
+    import whisper_backend
+
+    try:
+        if cpu_threads:
+            whisper_backend.set_cpu_threads(cpu_threads)
+        model, device = whisper_backend.load_model(model_name, compile=compile, quantize=quantize)
+    except Exception as e:
+        results.put(("loaded", None, f"{type(e).__name__}: {e}"))
+        return
+    results.put(("loaded", device, None))
+
+    while True:
+        request = requests.get()
+        if request is None:
+            break
+        job_id, audio_ref, kwargs = request
+        if not getattr(model, "accepts_vad_filter", False):
+            kwargs.pop("vad_filter", None)
+        try:
+            if isinstance(audio_ref, tuple):
+                audio = whisper_backend.stage_audio(_attach_shared_audio(*audio_ref), model)
+            else:
+                audio = audio_ref  # file path
+            result = model.transcribe(audio, **kwargs)
+            # Only what callers use crosses the process boundary (no tokens or logprobs)
+            segments = [{"start": seg["start"], "end": seg["end"], "text": seg["text"]}
+                        for seg in result.get("segments", [])]
+            results.put((job_id, {"text": result["text"], "segments": segments}, None))
+        except Exception as e:
+            results.put((job_id, None, f"{type(e).__name__}: {e}"))
+
+
+class RemoteWhisperModel:
+    """Whisper model stand-in whose transcribe() runs in a dedicated worker process.
+
+    The worker is restarted (and the model reloaded) if it dies, so a crash
+    only fails the segment that was being transcribed.
+    """
+
+    # Forwarded to faster-whisper; dropped by the worker for openai-whisper models
+    accepts_vad_filter = True
+
+    def __init__(self, model_name, compile=False, quantize=True, cpu_threads=None):
+        self.model_name = model_name
+        self.compile = compile
+        self.quantize = quantize
+        self.cpu_threads = cpu_threads
+        self.device = None
+        self._ctx = multiprocessing.get_context("spawn")
+        self._lock = threading.Lock()
+        self._next_job_id = 0
+        self._process = None
+        self._closed = False
+        self._start()
+
+    def _start(self):
+        self._requests = self._ctx.Queue()
+        self._results = self._ctx.Queue()
+        self._process = self._ctx.Process(
+            target=_worker_main,
+            args=(self.model_name, self.compile, self.quantize, self.cpu_threads, self._requests, self._results),
+            daemon=True,
+            name=f"whisper-{self.model_name}",
+        )
+        self._process.start()
+        _, device, error = self._wait_for("loaded")
+        if error:
+            self._stop()
+            raise RuntimeError(f"Whisper worker could not load {self.model_name}: {error}")
+        self.device = device
+        logger.info(f"Whisper worker process started (PID {self._process.pid}, {self.model_name} on {device})")
+
+    def _wait_for(self, job_id):
+        while True:
+            try:
+                result_id, payload, error = self._results.get(timeout=RESULT_POLL_INTERVAL)
+            except queue.Empty:
+                if not self._process.is_alive():
+                    raise RuntimeError(f"Whisper worker process exited (exit code {self._process.exitcode})")
+                continue
+            if result_id == job_id:
+                return result_id, payload, error
+
+    def transcribe(self, audio, **kwargs):
+        """Transcribe a file path or float32 array; returns a dict with 'text' and 'segments'."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(f"Whisper worker for {self.model_name} is closed")
+            if not self._process.is_alive():
+                logger.warning(f"Whisper worker for {self.model_name} died, restarting")
+                self._start()
+
+            self._next_job_id += 1
+            job_id = self._next_job_id
+            shm = None
+            try:
+                if isinstance(audio, str):
+                    audio_ref = audio
+                else:
+                    audio = np.ascontiguousarray(audio, dtype=np.float32)
+                    shm = shared_memory.SharedMemory(create=True, size=max(audio.nbytes, 1))
+                    np.ndarray(audio.shape, dtype=np.float32, buffer=shm.buf)[:] = audio
+                    audio_ref = (shm.name, audio.shape[0])
+                self._requests.put((job_id, audio_ref, kwargs))
+                _, result, error = self._wait_for(job_id)
+            finally:
+                if shm is not None:
+                    shm.close()
+                    shm.unlink()
+
+        if error:
+            raise RuntimeError(error)
+        return result
+
+    def close(self):
+        """Stop the worker process (after the transcription in progress, if any).
+
+        transcribe() raises afterwards instead of restarting the worker.
+        """
+        with self._lock:
+            self._closed = True
+            self._stop()
+
+    def _stop(self):
+        if self._process is None:
+            return
+        if self._process.is_alive():
+            self._requests.put(None)
+            self._process.join(timeout=5)
+        if self._process.is_alive():
+            self._process.terminate()
@@ -3,6 +3,7 @@ Tray Icon Actions Module
 Contains business logic for tray menu actions (no Qt/GUI code)
 """
 
+import threading
 from datetime import datetime
 from logging_config import get_logger
 
@@ -20,6 +21,7 @@ class TrayActions:
             voice_capture: The VoiceCapture instance (main application)
         """
         self.app = voice_capture
+        self.save_thread = None  # Background recorder stop/save of the last recording
 
     def toggle_recording(self):
         """Toggle recording - business logic only"""
@@ -35,30 +37,45 @@ class TrayActions:
 
     def stop_recording(self):
         """Stop recording - business logic only"""
+        if self.app.is_stopping:
+            # The recorder is still saving (or the recording is being finalized)
+            logger.info("Recording is already being stopped, ignoring")
+            return
         logger.info("Stopping recording from tray")
+        self.app.is_stopping = True
 
         try:
-            # Stop the recorder
-            self.app.current_audio_file, self.app.current_recording_id = self.app.recorder.stop_recording()
+            # Capture the stop moment before the (blocking) recorder shutdown;
+            # the recording name is formatted from it when the recording is finalized
+            self.app.pending_recording_timestamp = datetime.now()
 
-            # Auto-generate name based on timestamp
-            recording_name = f"Opname {datetime.now().strftime('%Y-%m-%d %H:%M')}"
-
-            # Store the recording name for later use
-            self.app.pending_recording_name = recording_name
+            # Stop the recorder and write the complete WAV off the GUI thread; the
+            # recording_saved signal continues with finalization when it is done
+            def stop_and_save():
+                try:
+                    audio_file, recording_id = self.app.recorder.stop_recording()
+                    self.app.recording_saved.emit(audio_file, recording_id)
+                except Exception as e:
+                    logger.error(f"Error saving recording: {e}", exc_info=True)
+                    # Nothing will finalize this recording; allow stopping it again
+                    self.app.is_stopping = False
 
-            # Wait for all segments to be transcribed, then finalize
-            logger.info(f"Recording stopped (tray mode), waiting for all segments to be transcribed...")
-            self.app.check_and_finalize_recording()
+            self.save_thread = threading.Thread(target=stop_and_save, name="recording-saver")
+            self.save_thread.start()
+            logger.info("Recording stopped (tray mode), saving audio...")
 
         except Exception as e:
             logger.error(f"Error stopping recording: {e}", exc_info=True)
             # Reset state even on error
             self.app.is_recording = False
+            self.app.is_stopping = False
             raise  # Re-raise so UI can handle it
 
-    def set_input_device(self, device_index):
-        """Set input device - business logic only"""
+    def set_input_device(self, device_index, device_name=None):
+        """Set input device - business logic only
+
+        device_name (e.g. the menu text) saves looking the name up again.
+        """
         try:
             self.app.recorder.set_input_device(device_index)
 
@@ -66,9 +83,12 @@ class TrayActions:
                 logger.info("Set input device to default")
                 return "Invoerapparaat ingesteld op standaard apparaat"
             else:
-                # Get device name
-                devices = self.app.recorder.get_audio_devices()
-                device_name = next((d['name'] for d in devices if d['index'] == device_index), f"Device {device_index}")
+                # Without a name, look it up in the snapshot the tray menu was built from
+                if device_name is None:
+                    device_name = self.app.audio_devices.get(device_index)
+                if device_name is None:
+                    devices = self.app.recorder.get_audio_devices()
+                    device_name = next((d['name'] for d in devices if d['index'] == device_index), f"Device {device_index}")
                 logger.info(f"Set input device to: {device_name}")
                 return f"Invoerapparaat ingesteld op: {device_name}"
 
@@ -101,17 +121,9 @@ class TrayActions:
         self.app.recording_manager.load_recordings()
         all_recordings = self.app.recording_manager.recordings
 
-        # Filter recordings to only include those with a WAV file
-        recordings = []
-        for recording in all_recordings:
-            recording_id = recording.get('id', '')
-            # Check if recording_<timestamp>.wav exists
-            rec_dir = self.app.recording_manager.recordings_dir / f"recording_{recording_id}"
-            audio_file = rec_dir / f"recording_{recording_id}.wav"
-            if audio_file.exists():
-                recordings.append(recording)
-
-        return recordings
+        # Filter recordings to only include those with a WAV file (one directory scan)
+        with_audio = self.app.recording_manager.recording_ids_with_audio()
+        return [recording for recording in all_recordings if recording.get('id', '') in with_audio]
 
     def start_retranscription(self, recording_id):
         """Start retranscription - business logic only"""
@@ -121,14 +133,12 @@ class TrayActions:
     def get_speaker_identification_queue(self):
         """Return recordings where all_participants_recognized is not True and wav exists, most recent first."""
         self.app.recording_manager.load_recordings()
+        with_audio = self.app.recording_manager.recording_ids_with_audio()
         queue = []
         for recording in self.app.recording_manager.recordings:
             if recording.get('all_participants_recognized') is True:
                 continue
-            recording_id = recording.get('id', '')
-            rec_dir = self.app.recording_manager.recordings_dir / f"recording_{recording_id}"
-            audio_file = rec_dir / f"recording_{recording_id}.wav"
-            if audio_file.exists():
+            if recording.get('id', '') in with_audio:
                 queue.append(recording)
         queue.sort(key=lambda r: r.get('id', ''), reverse=True)
         return queue
@@ -139,8 +149,6 @@ class TrayActions:
         Calls on_complete(recording_id, results, store, error) from that thread.
         GUI caller must switch to main thread (e.g. QTimer.singleShot) before touching Qt.
         """
-        import threading
-
         def _run():
             try:
                 from speaker_identification import identify_speakers
@@ -163,8 +171,11 @@ class TrayActions:
         logger.info("Quitting application...")
 
         try:
-            # Stop recording if active
-            if self.app.is_recording:
+            # Stop recording if active (or let a stop that is already saving finish)
+            if self.save_thread is not None and self.save_thread.is_alive():
+                logger.info("Waiting for recording to be saved...")
+                self.save_thread.join()
+            elif self.app.is_recording and not self.app.is_stopping:
                 logger.info("Stopping active recording...")
                 try:
                     self.app.recorder.stop_recording()
@@ -0,0 +1,351 @@
+"""
+Whisper Backend Module
+Loads Whisper models for the tray application (device selection, compilation)
+"""
+
+import gc
+import os
+import threading
+from pathlib import Path
+import whisper
+import torch
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import faster_whisper
+except ImportError:
+    faster_whisper = None
+
+# Persistent torch.compile artifacts, so warmup is only paid once per model/device/torch
+COMPILE_CACHE_DIR = Path.home() / ".cache" / "voice_capture"
+
+# Models outside openai-whisper's own registry: (Hugging Face repo, openai-format checkpoint)
+HF_CHECKPOINTS = {
+    "distil-large-v3": ("distil-whisper/distil-large-v3-openai", "model.bin"),
+}
+
+# MLX conversions that do not follow the mlx-community/whisper-{name}-mlx naming
+MLX_REPOS = {
+    "large-v3-turbo": "mlx-community/whisper-large-v3-turbo",
+    "distil-large-v3": "mlx-community/distil-whisper-large-v3",
+}
+
+# CTranslate2 compute type for faster-whisper on CPU (int8 GEMMs, ~4x smaller weights)
+FASTER_WHISPER_COMPUTE_TYPE = "int8"
+
+# Batch size for one-pass transcription of complete recordings with faster-whisper
+BATCH_SIZE = 8
+
+# Largest input staged through the reusable pinned buffer (one 30 s Whisper window)
+STAGING_MAX_SAMPLES = whisper.audio.N_SAMPLES
+
+# Inter-op pool size; can only be set before torch runs any parallel work.
+# Segments are transcribed one at a time by a single worker, so one is enough
+INTEROP_THREADS = 1
+
+# Preferred int8 kernels for dynamic quantization (x86 first, qnnpack on ARM)
+QUANTIZED_ENGINES = ("x86", "fbgemm", "onednn", "qnnpack")
+
+# Per-thread pinned host buffer (live segments and retranscription run on different threads)
+_staging = threading.local()
+
+
+def _configure_cpu_backend():
+    """Enable the oneDNN fast paths and pick the best quantized engine for this CPU."""
+    try:
+        torch.set_num_interop_threads(INTEROP_THREADS)
+    except RuntimeError as e:
+        logger.debug(f"Could not set torch inter-op threads: {e}")
+
+    torch.backends.mkldnn.enabled = True
+    supported = torch.backends.quantized.supported_engines
+    engine = next((e for e in QUANTIZED_ENGINES if e in supported), None)
+    if engine:
+        torch.backends.quantized.engine = engine
+        logger.debug(f"Torch quantized engine: {engine}")
+
+
+_configure_cpu_backend()
+
+
+def set_cpu_threads(n_threads):
+    """Limit the torch intra-op thread pool used for CPU inference."""
+    torch.set_num_threads(n_threads)
+    logger.info(f"Torch CPU threads set to {n_threads}")
+
+
+def detect_device():
+    """Return the best available torch device name."""
+    if torch.cuda.is_available():
+        return "cuda"
+    if torch.backends.mps.is_available():
+        return "mps"
+    return "cpu"
+
+
+def mlx_repo(model_name):
+    """Return the mlx-whisper repository for a model name."""
+    return MLX_REPOS.get(model_name, f"mlx-community/whisper-{model_name}-mlx")
+
+
+def _resolve_checkpoint(model_name):
+    """Map a model name to what whisper.load_model accepts (registry name or checkpoint path)."""
+    if model_name not in HF_CHECKPOINTS:
+        return model_name
+    from huggingface_hub import hf_hub_download
+    repo_id, filename = HF_CHECKPOINTS[model_name]
+    return hf_hub_download(repo_id=repo_id, filename=filename)
+
+
+def _load_whisper_mmap(name, device):
+    """whisper.load_model, but with the checkpoint memory-mapped instead of read into RAM.
+
+    The weights are copied straight from the page cache into the model's
+    parameters, so the checkpoint never also sits in process memory. Uses
+    openai-whisper's private download helpers (see the pin in requirements.txt);
+    load_model falls back to whisper.load_model on any error.
+    """
+    if name in whisper._MODELS:
+        default = os.path.join(os.path.expanduser("~"), ".cache")
+        download_root = os.path.join(os.getenv("XDG_CACHE_HOME", default), "whisper")
+        checkpoint_file = whisper._download(whisper._MODELS[name], download_root, False)
+        alignment_heads = whisper._ALIGNMENT_HEADS[name]
+    else:
+        checkpoint_file, alignment_heads = name, None
+
+    checkpoint = torch.load(checkpoint_file, map_location="cpu", mmap=True, weights_only=True)
+    model = whisper.model.Whisper(whisper.model.ModelDimensions(**checkpoint["dims"]))
+    # No assign=True: the fp16 checkpoint tensors are cast into the fp32 parameters
+    model.load_state_dict(checkpoint["model_state_dict"])
+    del checkpoint
+
+    if alignment_heads is not None:
+        model.set_alignment_heads(alignment_heads)
+    return model.to(device)
+
+
+def _compile_cache_supported():
+    compiler = getattr(torch, "compiler", None)
+    return hasattr(compiler, "save_cache_artifacts") and hasattr(compiler, "load_cache_artifacts")
+
+
+def _compile_cache_path(model_name, device):
+    """Cache file keyed by model, torch version and device architecture to avoid stale artifacts."""
+    if device == "cuda":
+        major, minor = torch.cuda.get_device_capability()
+        arch = f"sm{major}{minor}"
+    else:
+        arch = device
+    return COMPILE_CACHE_DIR / f"compile_{model_name}_torch{torch.__version__}_{arch}.bin"
+
+
+def _load_compile_cache(model_name, device):
+    path = _compile_cache_path(model_name, device)
+    if not path.exists():
+        return False
+    try:
+        torch.compiler.load_cache_artifacts(path.read_bytes())
+        logger.info(f"Loaded torch.compile cache from {path}")
+        return True
+    except Exception as e:
+        logger.warning(f"Could not load torch.compile cache {path}: {e}")
+        return False
+
+
+def _save_compile_cache(model_name, device):
+    try:
+        artifacts = torch.compiler.save_cache_artifacts()
+        if artifacts is None:
+            return
+        path = _compile_cache_path(model_name, device)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(artifacts[0])
+        logger.info(f"Saved torch.compile cache to {path}")
+    except Exception as e:
+        logger.warning(f"Could not save torch.compile cache: {e}")
+
+
+def compile_model(model, model_name, device):
+    """Compile the audio encoder and text decoder and warm them up, reusing cached artifacts.
+
+    The encoder always sees one fixed-shape 30 s window. The decoder's token and
+    KV-cache lengths grow every step, so it is compiled with dynamic shapes:
+    one graph then serves every decoding step instead of one per length.
+    """
+    cache_supported = _compile_cache_supported()
+    cache_hit = cache_supported and _load_compile_cache(model_name, device)
+
+    eager_encoder, eager_decoder = model.encoder, model.decoder
+    model.encoder = torch.compile(eager_encoder)
+    model.decoder = torch.compile(eager_decoder, dynamic=True)
+
+    # Warmup: one dummy forward pass each triggers compilation (or loads it from the cache)
+    mel = torch.zeros(1, model.dims.n_mels, whisper.audio.N_FRAMES, device=device)
+    tokens = torch.zeros(1, 3, dtype=torch.long, device=device)
+    try:
+        with torch.inference_mode():
+            audio_features = model.encoder(mel)
+            model.decoder(tokens, audio_features)
+    except Exception:
+        model.encoder, model.decoder = eager_encoder, eager_decoder
+        raise
+
+    if cache_supported and not cache_hit:
+        _save_compile_cache(model_name, device)
+    return model
+
+
+class FasterWhisperModel:
+    """faster-whisper (CTranslate2) model with the openai-whisper transcribe() interface."""
+
+    accepts_vad_filter = True
+
+    def __init__(self, model_name, compute_type=FASTER_WHISPER_COMPUTE_TYPE):
+        self.model_name = model_name
+        self.device = "cpu"
+        self._batched = None
+        options = dict(device="cpu", compute_type=compute_type, cpu_threads=torch.get_num_threads(), num_workers=1)
+        try:
+            # Converted models are cached by the Hugging Face hub; loading from that cache
+            # directly skips the network round-trip that checks for a newer revision
+            self.model = faster_whisper.WhisperModel(model_name, local_files_only=True, **options)
+        except Exception:
+            logger.info(f"faster-whisper model {model_name} not cached yet, downloading...")
+            self.model = faster_whisper.WhisperModel(model_name, **options)
+
+    def transcribe(self, audio, task="transcribe", fp16=False, verbose=False, vad_filter=True, **kwargs):
+        """Transcribe a file path or 16 kHz float32 array; returns a dict with 'text' and 'segments'.
+
+        vad_filter drops pauses inside the audio before decoding (timestamps
+        still refer to the original audio).
+        """
+        # Greedy decoding, matching openai-whisper's transcribe() default
+        segments, _info = self.model.transcribe(audio, task=task, beam_size=1, vad_filter=vad_filter, **kwargs)
+        return _result_dict(segments)
+
+    def transcribe_batched(self, audio, task="transcribe"):
+        """Transcribe a long recording with VAD chunking and batched decoding."""
+        if self._batched is None:
+            self._batched = faster_whisper.BatchedInferencePipeline(model=self.model)
+        segments, _info = self._batched.transcribe(audio, task=task, batch_size=BATCH_SIZE)
+        return _result_dict(segments)
+
+
+def _result_dict(segments):
+    """Collect faster-whisper segments into an openai-whisper style result dict."""
+    parts = [{"start": segment.start, "end": segment.end, "text": segment.text} for segment in segments]
+    return {"text": "".join(part["text"] for part in parts), "segments": parts}
+
+
+def quantize_model(model):
+    """Apply dynamic int8 quantization to the Linear layers of a CPU Whisper model."""
+    # whisper.model.Linear only adds a dtype cast to nn.Linear's forward (a no-op in fp32);
+    # quantize_dynamic only recognises the exact nn.Linear type
+    for module in model.modules():
+        if type(module) is whisper.model.Linear:
+            module.__class__ = torch.nn.Linear
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def _use_inference_mode(model):
+    """Run the model's transcribe() under torch.inference_mode (no autograd bookkeeping)."""
+    transcribe = model.transcribe
+
+    def transcribe_inference_mode(*args, **kwargs):
+        with torch.inference_mode():
+            return transcribe(*args, **kwargs)
+
+    model.transcribe = transcribe_inference_mode
+    return model
+
+
+def load_model(model_name, device=None, compile=False, quantize=True):
+    """Load a Whisper model on the given (or best available) device.
+
+    On CPU the faster-whisper backend is used when it is installed; quantize
+    selects int8 weights on CPU (both backends) instead of fp32.
+    """
+    device = device or detect_device()
+    if device == "cpu" and faster_whisper is not None:
+        compute_type = FASTER_WHISPER_COMPUTE_TYPE if quantize else "float32"
+        logger.info(f"Loading {model_name} model with faster-whisper ({compute_type}) on cpu...")
+        try:
+            return FasterWhisperModel(model_name, compute_type=compute_type), device
+        except Exception as e:
+            # e.g. a model name this faster-whisper version does not know (large-v3-turbo < 1.1)
+            logger.warning(f"faster-whisper could not load {model_name}, using openai-whisper: {e}")
+
+    logger.info(f"Loading {model_name} model on {device}...")
+    checkpoint = _resolve_checkpoint(model_name)
+    try:
+        model = _load_whisper_mmap(checkpoint, device)
+    except Exception as e:
+        # The fast path relies on openai-whisper internals and torch >= 2.1 (mmap);
+        # any failure there (API change, legacy non-zip checkpoint) uses the public loader
+        logger.info(f"Memory-mapped load of {model_name} failed, using whisper.load_model: {e}")
+        model = whisper.load_model(checkpoint, device=device)
+    if device == "cpu" and quantize:
+        try:
+            model = quantize_model(model)
+            logger.info(f"Applied dynamic int8 quantization to {model_name}")
+        except Exception as e:
+            logger.warning(f"Dynamic quantization failed for {model_name}, using fp32 model: {e}")
+    if compile:
+        try:
+            model = compile_model(model, model_name, device)
+        except Exception as e:
+            logger.warning(f"torch.compile failed for {model_name}, using eager model: {e}")
+    return _use_inference_mode(model), device
+
+
+def release_memory():
+    """Collect released models and return cached GPU memory to the driver."""
+    gc.collect()
+    if torch.cuda.is_available():
+        torch.cuda.empty_cache()
+
+
+def warm_up(model):
+    """Transcribe one second of silence to initialise kernels, thread pools and caches."""
+    import numpy as np
+    # Silence would be filtered out entirely by faster-whisper's VAD before reaching the model
+    kwargs = {"vad_filter": False} if getattr(model, "accepts_vad_filter", False) else {}
+    try:
+        model.transcribe(np.zeros(whisper.audio.SAMPLE_RATE, dtype=np.float32),
+                         task="transcribe", fp16=False, verbose=False, **kwargs)
+    except Exception as e:
+        logger.warning(f"Model warmup failed: {e}")
+
+
+def transcribe_long(model, audio):
+    """Transcribe a complete recording in a single call (batched on faster-whisper)."""
+    if isinstance(model, FasterWhisperModel):
+        return model.transcribe_batched(audio)
+    return model.transcribe(audio, task="transcribe", fp16=False, verbose=False)
+
+
+def stage_audio(audio, model):
+    """Move float32 audio onto a CUDA model's device before transcribe().
+
+    Whisper then computes the log-mel spectrogram on the GPU instead of the CPU.
+    Segment-sized inputs are copied through a pinned host buffer that is
+    allocated once per thread and reused; other models get the array unchanged.
+    """
+    device = getattr(model, "device", None)
+    if not isinstance(device, torch.device) or device.type != "cuda":
+        return audio
+
+    samples = torch.from_numpy(audio)
+    if len(audio) > STAGING_MAX_SAMPLES:
+        return samples.to(device)
+
+    buffer = getattr(_staging, "buffer", None)
+    if buffer is None:
+        buffer = torch.empty(STAGING_MAX_SAMPLES, dtype=torch.float32, pin_memory=True)
+        _staging.buffer = buffer
+    staged = buffer[:len(audio)]
+    staged.copy_(samples)
+    # Synchronous copy: the buffer is reused by the next call on this thread
+    return staged.to(device)